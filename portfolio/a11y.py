@@ -0,0 +1,230 @@
+"""Basic accessibility checks for rendered HTML.
+
+One streaming ``html.parser`` pass per document collects what the checks
+need:
+
+ - presence of <html lang="...">
+ - images missing alt or empty alt
+ - form inputs with id but no matching <label for="id">
+ - multiple H1s and heading order issues
+ - links with no text and no aria-label/title
+
+``scan_html`` checks a document in memory (the static exporter runs it on
+every page it renders), ``scan_folder`` checks a tree of files in parallel
+worker processes (``tools/a11y_scan.py``). No Django or third-party imports,
+so the command-line tool runs without a configured project.
+"""
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+Finding = namedtuple('Finding', 'rule message line')
+
+RULES = {
+    'html-lang': 'The <html> element declares the page language',
+    'img-alt': 'Images have an alt attribute',
+    'img-empty-alt': 'Images with empty alt are meant to be decorative',
+    'input-label': 'Form fields with an id have a <label for="...">',
+    'multiple-h1': 'A page has at most one <h1>',
+    'heading-order': 'Heading levels do not skip',
+    'link-name': 'Links have text or an aria-label/title',
+}
+RULE_ORDER = {rule: order for order, rule in enumerate(RULES)}
+
+LANG_RE = re.compile(r'[a-zA-Z-]+')
+HEADINGS = {f'h{level}': level for level in range(1, 7)}
+UNLABELLED_INPUT_TYPES = {'hidden', 'submit', 'button'}
+READ_SIZE = 64 * 1024
+
+
+class A11yParser(HTMLParser):
+    """Collects everything the checks need in one pass over the document.
+
+    Label ``for`` ids go into a set and fields are checked against it at the
+    end, so a label may come before or after its field.
+    """
+
+    def __init__(self, fragment=False):
+        super().__init__(convert_charrefs=True)
+        self.fragment = fragment
+        self.findings = []
+        self.has_lang = False
+        self.label_ids = set()
+        self.fields = []          # (id, start tag text, line)
+        self.headings = []        # (level, line)
+        self._links = []          # open <a> elements: [source parts, line, text parts, labelled]
+
+    def _add(self, rule, message, line=None):
+        self.findings.append(Finding(rule, message, line or self.getpos()[0]))
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self._links:
+            self._link_source(self.get_starttag_text())
+            if 'aria-label' in attrs or 'title' in attrs:
+                self._links[-1][3] = True
+
+        if tag == 'html':
+            self.has_lang = bool(LANG_RE.fullmatch(attrs.get('lang') or ''))
+        elif tag == 'img':
+            src = attrs.get('src') or '(unknown)'
+            alt = attrs.get('alt')
+            if alt is None:
+                self._add('img-alt', f'Image without alt: {src}')
+            elif alt.strip() == '':
+                self._add('img-empty-alt', f'Image with empty alt (decorative): {src}')
+        elif tag in ('input', 'textarea', 'select'):
+            if (attrs.get('type') or '').lower() in UNLABELLED_INPUT_TYPES:
+                return
+            if attrs.get('id'):
+                self.fields.append((attrs['id'], self.get_starttag_text(), self.getpos()[0]))
+        elif tag == 'label':
+            if attrs.get('for'):
+                self.label_ids.add(attrs['for'])
+        elif tag in HEADINGS:
+            self.headings.append((HEADINGS[tag], self.getpos()[0]))
+        elif tag == 'a':
+            labelled = 'aria-label' in attrs or 'title' in attrs
+            self._links.append([[self.get_starttag_text()], self.getpos()[0], [], labelled])
+
+    def handle_endtag(self, tag):
+        if self._links:
+            self._link_source(f'</{tag}>')
+            if tag == 'a':
+                self._close_link(self._links.pop())
+
+    def handle_data(self, data):
+        if self._links:
+            self._link_source(data)
+            for link in self._links:
+                link[2].append(data)
+
+    def _link_source(self, text):
+        # Enough of the element's source for the report, which shows 60 characters
+        for link in self._links:
+            if sum(map(len, link[0])) < 60:
+                link[0].append(text)
+
+    def _close_link(self, link):
+        source, line, text, labelled = link
+        if ''.join(text).strip() == '' and not labelled:
+            self._add('link-name', f'Link with no text and no label/title: {"".join(source)[:60]}', line)
+
+    def finish(self):
+        self.close()
+        while self._links:
+            self._close_link(self._links.pop())
+
+        if not self.has_lang and not self.fragment:
+            self._add('html-lang', 'Missing <html lang="...">', 1)
+        for field_id, start_tag, line in self.fields:
+            if field_id not in self.label_ids:
+                self._add('input-label', f'Input may be missing label for id "{field_id}": {start_tag[:60]}', line)
+
+        if self.fragment:
+            self.headings = []
+        h1_count = sum(1 for level, _ in self.headings if level == 1)
+        if h1_count > 1:
+            line = [line for level, line in self.headings if level == 1][1]
+            self._add('multiple-h1', f'Multiple H1 elements ({h1_count})', line)
+        last = 0
+        for level, line in self.headings:
+            if level - last > 1:
+                self._add('heading-order', 'Heading order jumps detected (e.g., h2 -> h4)', line)
+                break
+            last = level
+        # Report in the same order as the checks are listed above
+        self.findings.sort(key=lambda finding: RULE_ORDER[finding.rule])
+        return self.findings
+
+
+def scan_html(html, fragment=False):
+    """Findings for one document given as text (or UTF-8 bytes).
+
+    ``fragment`` is for partial HTML meant to be inserted into a page, which
+    has no <html> element and no heading outline of its own.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    parser = A11yParser(fragment)
+    parser.feed(html)
+    return parser.finish()
+
+
+def scan_file(path):
+    parser = A11yParser()
+    with open(path, 'r', encoding='utf-8') as f:
+        while chunk := f.read(READ_SIZE):
+            parser.feed(chunk)
+    return parser.finish()
+
+
+def html_files(folder):
+    for root, _, files in os.walk(folder):
+        for f in sorted(files):
+            if f.lower().endswith('.html'):
+                yield os.path.join(root, f)
+
+
+def scan_folder(folder, jobs=None):
+    """Findings per file for every .html file under ``folder`` (files without findings are left out)."""
+    paths = sorted(html_files(folder))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2 * jobs:
+        scanned = list(map(scan_file, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            scanned = list(executor.map(scan_file, paths, chunksize=max(1, len(paths) // (jobs * 8))))
+    return {path: findings for path, findings in zip(paths, scanned) if findings}
+
+
+def to_text(results):
+    if not results:
+        return 'No basic accessibility issues found.\n'
+    lines = ['', 'Accessibility scan results:']
+    for path, findings in results.items():
+        lines.append('')
+        lines.append(f'-- {path}')
+        lines.extend(f'   - {finding.message}' for finding in findings)
+    return '\n'.join(lines) + '\n'
+
+
+def to_json(results):
+    return json.dumps({
+        path: [finding._asdict() for finding in findings]
+        for path, findings in results.items()
+    }, indent=2) + '\n'
+
+
+def to_sarif(results):
+    return json.dumps({
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {
+                'name': 'a11y_scan',
+                'rules': [
+                    {'id': rule, 'shortDescription': {'text': text}}
+                    for rule, text in RULES.items()
+                ],
+            }},
+            'results': [
+                {
+                    'ruleId': finding.rule,
+                    'level': 'note' if finding.rule == 'img-empty-alt' else 'warning',
+                    'message': {'text': finding.message},
+                    'locations': [{'physicalLocation': {
+                        'artifactLocation': {'uri': path.replace(os.sep, '/')},
+                        'region': {'startLine': finding.line},
+                    }}],
+                }
+                for path, findings in results.items() for finding in findings
+            ],
+        }],
+    }, indent=2) + '\n'
+
+
+FORMATS = {'text': to_text, 'json': to_json, 'sarif': to_sarif}
@@ -1,67 +1,233 @@
+from django.conf import settings
 from django.contrib import admin
-from .models import Project, Skill, Person, Experience, Education, Testimonial, Technology
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from django.utils.http import urlencode
+from .models import Project, Skill, Person, Experience, Education, Testimonial, Technology, Category, OutboxMessage, PortfolioStats
+from .stats import category_choices
+
+
+# Models whose row count is kept in PortfolioStats -> its field
+MAINTAINED_COUNTS = {
+    Project: 'project_count',
+    Person: 'person_count',
+    Technology: 'technology_count',
+    Testimonial: 'testimonial_count',
+}
+
+
+def maintained_row_count(model, using):
+    """The row count kept in PortfolioStats, or None if the model has none."""
+    field = MAINTAINED_COUNTS.get(model)
+    if field is None:
+        return None
+    return (
+        PortfolioStats.objects.using(using).filter(pk=PortfolioStats.SINGLETON_PK)
+        .values_list(field, flat=True).first()
+    )
+
+
+def estimated_row_count(model, using):
+    """The database's own estimate of a table's size, or None if it has none."""
+    connection = connections[using]
+    table = model._meta.db_table
+    queries = {
+        'postgresql': ('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table]),
+        'mysql': ('SELECT table_rows FROM information_schema.tables '
+                  'WHERE table_schema = DATABASE() AND table_name = %s', [table]),
+        # Filled by ANALYZE (see stats.analyze_tables); the first number is the row count
+        'sqlite': ('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table]),
+    }
+    if connection.vendor not in queries:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(*queries[connection.vendor])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None:
+        return None
+    return int(str(row[0]).split()[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids COUNT(*) over large, unfiltered changelists.
+
+    Models with a maintained total in PortfolioStats use it; other tables use
+    the database's size estimate when it is at least
+    PORTFOLIO_ADMIN_ESTIMATE_COUNT_OVER rows. An exact COUNT(*) is still used
+    once a filter or search applies, and for small tables, where it is cheap.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            maintained = maintained_row_count(queryset.model, queryset.db)
+            if maintained is not None:
+                return maintained
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= getattr(settings, 'PORTFOLIO_ADMIN_ESTIMATE_COUNT_OVER', 10000):
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second COUNT(*) over the whole table behind "N total"
+    show_full_result_count = False
+
+
+class CategoryListFilter(admin.SimpleListFilter):
+    """Category filter whose choices come from the Category table instead of
+    a DISTINCT over every project."""
+    title = 'category'
+    parameter_name = 'category'
+
+    def lookups(self, request, model_admin):
+        return [(name, name) for name in category_choices()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(category=self.value())
+        return queryset
+
+
+class CappedInlineFormSet(BaseInlineFormSet):
+    """Shows at most ``limit`` existing rows; the rest are edited from their own
+    changelist, linked from the parent's change form (see PersonAdmin.history_links)."""
+    limit = 20
+
+    def get_queryset(self):
+        if not hasattr(self, '_capped_queryset'):
+            self._capped_queryset = super().get_queryset()[:self.limit]
+        return self._capped_queryset
 
 
 class EducationInline(admin.TabularInline):
     model = Education
+    formset = CappedInlineFormSet
     extra = 1
     fields = ('school', 'program', 'graduation_year', 'description')
 
 
 class ExperienceInline(admin.TabularInline):
     model = Experience
+    formset = CappedInlineFormSet
     extra = 1
     fields = ('title', 'company', 'start_date', 'end_date', 'is_current', 'description')
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(LargeTableAdmin):
     list_display = ('title', 'category', 'link', 'created_at')
     prepopulated_fields = {'slug': ('title',)}
-    list_filter = ('category', 'created_at')
+    list_filter = (CategoryListFilter, 'created_at')
     search_fields = ('title', 'description')
-    filter_horizontal = ('technologies',)
+    autocomplete_fields = ('technologies',)
+    ordering = ('-created_at', '-id')
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'project_count')
+    readonly_fields = ('name', 'project_count')
+
+
+@admin.register(PortfolioStats)
+class PortfolioStatsAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'project_count', 'person_count', 'technology_count', 'testimonial_count', 'average_rating')
+    readonly_fields = ('project_count', 'person_count', 'technology_count', 'testimonial_count', 'rating_sum')
+
+    def has_add_permission(self, request):
+        return False
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(LargeTableAdmin):
     list_display = ('name',)
+    search_fields = ('name',)
+    ordering = ('name',)
 
 
 @admin.register(Technology)
-class TechnologyAdmin(admin.ModelAdmin):
+class TechnologyAdmin(LargeTableAdmin):
     list_display = ('name', 'icon')
+    search_fields = ('name',)
+    ordering = ('name',)
 
 
 @admin.register(Person)
-class PersonAdmin(admin.ModelAdmin):
+class PersonAdmin(LargeTableAdmin):
     list_display = ('name', 'contact_number', 'order')
+    search_fields = ('name',)
     fieldsets = (
         ('Personal Info', {'fields': ('name', 'photo', 'bio', 'contact_number', 'order')}),
         ('Emails', {'fields': ('email_primary', 'email_secondary')}),
         ('Social Media', {'fields': ('facebook', 'instagram', 'github', 'linkedin', 'twitter')}),
         ('Skills', {'fields': ('skills',)}),
+        ('Education and experience', {'fields': ('history_links',)}),
     )
+    readonly_fields = ('history_links',)
     inlines = [EducationInline, ExperienceInline]
-    filter_horizontal = ('skills',)
+    autocomplete_fields = ('skills',)
+
+    @admin.display(description='All entries')
+    def history_links(self, obj):
+        """Links to the person's full education and experience changelists,
+        since the inlines below stop at CappedInlineFormSet.limit rows."""
+        if obj is None or obj.pk is None:
+            return '-'
+        links = []
+        for model in (Education, Experience):
+            url = reverse(f'admin:portfolio_{model._meta.model_name}_changelist')
+            count = model.objects.filter(person=obj).count()
+            name = str(model._meta.verbose_name_plural).lower()
+            links.append((f'{url}?{urlencode({"person__id__exact": obj.pk})}', count, name))
+        return format_html_join(format_html(' &middot; '), '<a href="{}">{} {}</a>', links)
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
-    list_display = ('title', 'company', 'start_date', 'end_date', 'is_current')
+class ExperienceAdmin(LargeTableAdmin):
+    list_display = ('title', 'company', 'person', 'start_date', 'end_date', 'is_current')
+    list_select_related = ('person',)
     list_filter = ('company', 'is_current', 'start_date')
     search_fields = ('title', 'company', 'description')
+    autocomplete_fields = ('person',)
 
 
 @admin.register(Education)
-class EducationAdmin(admin.ModelAdmin):
-    list_display = ('program', 'school', 'graduation_year')
+class EducationAdmin(LargeTableAdmin):
+    list_display = ('program', 'school', 'person', 'graduation_year')
+    list_select_related = ('person',)
     list_filter = ('graduation_year', 'school')
     search_fields = ('program', 'school')
+    autocomplete_fields = ('person',)
 
 
 @admin.register(Testimonial)
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(LargeTableAdmin):
     list_display = ('client_name', 'role', 'rating', 'created_at')
     list_filter = ('rating', 'created_at')
     search_fields = ('client_name', 'quote')
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'reply_to')
+    readonly_fields = ('attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ('retry_now',)
+
+    @admin.action(description='Retry selected messages now')
+    def retry_now(self, request, queryset):
+        queryset.exclude(status=OutboxMessage.SENT).update(
+            status=OutboxMessage.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
@@ -0,0 +1,194 @@
+"""Read-only JSON API over the portfolio content.
+
+``/api/people/``, ``/api/projects/`` and ``/api/testimonials/`` return
+``{"count": N, "results": [...]}``. ``?fields=a,b`` narrows each result to
+the named fields. A payload is serialized once per content version and field
+selection and kept in the cache as bytes, with its compressed variants;
+revalidation is answered with a 304 by ``conditional_by_version``.
+
+Project lists longer than PORTFOLIO_API_STREAM_OVER rows are streamed while
+they are serialized, then cached like any other payload.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Callable
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+
+from .cache import compressed_response, conditional_by_version, get_cache, get_content_version
+from .compress import precompressed_variants
+from .db.router import read_only_database
+from .models import Education, Experience, Person, Project, Skill, Technology, Testimonial
+from .pagination import KEYSET_ORDERING
+from .queries import people_queryset, projects_queryset
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+def _file_url(field_file):
+    return field_file.url if field_file else None
+
+
+def _attr(name):
+    return lambda obj: getattr(obj, name)
+
+
+def _rows(related, fields):
+    return [{field: getattr(row, field) for field in fields} for row in related.all()]
+
+
+@dataclass(frozen=True)
+class Resource:
+    name: str
+    queryset: Callable
+    # Field name -> function of the object giving its JSON value
+    fields: dict
+    # Models whose edits change the payload, for ETag/Last-Modified
+    models: tuple
+    streams: bool = False
+
+
+PEOPLE = Resource(
+    name='people',
+    queryset=lambda: people_queryset().prefetch_related(
+        Prefetch('experiences', queryset=Experience.objects.all()),
+    ),
+    fields={
+        'id': _attr('pk'),
+        **{name: _attr(name) for name in (
+            'name', 'bio', 'contact_number', 'email_primary', 'facebook', 'instagram',
+            'github', 'linkedin', 'twitter', 'order',
+        )},
+        'photo': lambda person: _file_url(person.photo),
+        'skills': lambda person: [skill.name for skill in person.skills.all()],
+        'education': lambda person: _rows(
+            person.education, ('school', 'program', 'description', 'graduation_year'),
+        ),
+        'experiences': lambda person: _rows(
+            person.experiences, ('title', 'company', 'description', 'start_date', 'end_date', 'is_current'),
+        ),
+    },
+    models=(Person, Skill, Education, Experience),
+)
+
+PROJECTS = Resource(
+    name='projects',
+    queryset=lambda: projects_queryset().order_by(*KEYSET_ORDERING),
+    fields={
+        'id': _attr('pk'),
+        **{name: _attr(name) for name in ('title', 'slug', 'description', 'link', 'category', 'created_at')},
+        'url': lambda project: reverse('portfolio:project_detail', args=[project.slug]),
+        'image': lambda project: _file_url(project.image),
+        'technologies': lambda project: [tech.name for tech in project.technologies.all()],
+    },
+    models=(Project, Technology),
+    streams=True,
+)
+
+TESTIMONIALS = Resource(
+    name='testimonials',
+    queryset=lambda: Testimonial.objects.all(),
+    fields={
+        'id': _attr('pk'),
+        **{name: _attr(name) for name in ('client_name', 'role', 'quote', 'rating', 'created_at')},
+    },
+    models=(Testimonial,),
+)
+
+
+def stream_threshold():
+    return getattr(settings, 'PORTFOLIO_API_STREAM_OVER', 500)
+
+
+def selected_fields(resource, request):
+    """Requested field names in the resource's order, or None if one is unknown."""
+    requested = request.GET.get('fields', '')
+    if not requested:
+        return list(resource.fields)
+    names = {name.strip() for name in requested.split(',') if name.strip()}
+    if names - resource.fields.keys():
+        return None
+    return [name for name in resource.fields if name in names]
+
+
+def payload_key(resource, fields):
+    digest = hashlib.md5(','.join(fields).encode('utf-8')).hexdigest()
+    return f'portfolio:api:{get_content_version()}:{resource.name}:{digest}'
+
+
+def encode_item(resource, obj, fields):
+    return json.dumps(
+        {field: resource.fields[field](obj) for field in fields},
+        cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False,
+    ).encode('utf-8')
+
+
+def iter_payload(resource, queryset, fields, count, chunk_size=500):
+    """The payload as a series of byte strings, reading ``chunk_size`` rows at a time."""
+    yield b'{"count":%d,"results":[' % count
+    for i, obj in enumerate(queryset.iterator(chunk_size=chunk_size)):
+        yield (b',' if i else b'') + encode_item(resource, obj, fields)
+    yield b']}'
+
+
+def _store(key, content):
+    timeout = getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+    variants = precompressed_variants('.json', content)
+    get_cache().set(key, (content, variants), timeout)
+    return variants
+
+
+def _caching_stream(key, chunks):
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    # Only a stream that ran to the end is stored
+    _store(key, b''.join(parts))
+
+
+def resource_response(request, resource):
+    fields = selected_fields(resource, request)
+    if fields is None:
+        return JsonResponse(
+            {'error': f'Unknown field. Available fields: {", ".join(resource.fields)}'}, status=400,
+        )
+
+    headers = {'Content-Type': JSON_CONTENT_TYPE}
+    key = payload_key(resource, fields)
+    cached = get_cache().get(key)
+    if cached is not None:
+        return compressed_response(request, cached[0], headers, cached[1])
+
+    # Pinned now: a stream is read after the view has returned and left read_only_database
+    queryset = resource.queryset()
+    queryset = queryset.using(queryset.db)
+    count = queryset.count()
+    chunks = iter_payload(resource, queryset, fields, count)
+    if resource.streams and count > stream_threshold():
+        return StreamingHttpResponse(_caching_stream(key, chunks), content_type=JSON_CONTENT_TYPE)
+    content = b''.join(chunks)
+    return compressed_response(request, content, headers, _store(key, content))
+
+
+@read_only_database
+@conditional_by_version(*PEOPLE.models)
+def people(request):
+    return resource_response(request, PEOPLE)
+
+
+@read_only_database
+@conditional_by_version(*PROJECTS.models)
+def projects(request):
+    return resource_response(request, PROJECTS)
+
+
+@read_only_database
+@conditional_by_version(*TESTIMONIALS.models)
+def testimonials(request):
+    return resource_response(request, TESTIMONIALS)
@@ -0,0 +1,89 @@
+"""Static and media file serving with precompressed variants.
+
+``collectstatic`` (through ``portfolio.storage``) and the exporter write
+``.gz``/``.br`` siblings next to text assets; these views hand them out when
+the client's Accept-Encoding allows, falling back to the plain file.
+Content-hashed static names are sent with a far-future immutable
+Cache-Control, since a new version always gets a new name.
+"""
+import mimetypes
+import posixpath
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compress import ENCODING_SUFFIXES, negotiate_encoding
+
+
+def _file_response(request, path, cache_control=None):
+    path = Path(path)
+    if not path.is_file():
+        raise Http404('File not found')
+    stat = path.stat()
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(path.name)
+    available = {
+        coding for coding, suffix in ENCODING_SUFFIXES.items()
+        if path.with_name(path.name + suffix).is_file()
+    }
+    encoding = negotiate_encoding(request, available)
+    body = path.with_name(path.name + ENCODING_SUFFIXES[encoding]) if encoding else path
+
+    response = FileResponse(body.open('rb'), content_type=content_type or 'application/octet-stream')
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if cache_control:
+        response['Cache-Control'] = cache_control
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if available:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def _collected_file(path):
+    """``path`` under STATIC_ROOT, or None."""
+    if not settings.STATIC_ROOT:
+        return None
+    try:
+        candidate = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    return candidate if candidate.is_file() else None
+
+
+def serve_static(request, path):
+    """A static file, from the app and project static folders or STATIC_ROOT.
+
+    With DEBUG on the finders come first, so edits show up without running
+    collectstatic again; otherwise the collected copy (content-hashed, with
+    its precompressed siblings) is served.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    if settings.DEBUG:
+        absolute = finders.find(path) or _collected_file(path)
+    else:
+        absolute = _collected_file(path) or finders.find(path)
+    if not absolute:
+        raise Http404('File not found')
+    cache_control = None
+    if path in getattr(staticfiles_storage, 'immutable_names', ()):
+        cache_control = settings.PORTFOLIO_IMMUTABLE_CACHE_CONTROL
+    return _file_response(request, absolute, cache_control)
+
+
+def serve_media(request, path):
+    try:
+        absolute = safe_join(settings.MEDIA_ROOT, posixpath.normpath(path).lstrip('/'))
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    return _file_response(request, absolute)
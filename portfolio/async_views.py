@@ -0,0 +1,52 @@
+"""Async versions of the read-heavy public views, for ASGI deployments.
+
+``portfolio/urls.py`` routes to these instead of ``portfolio.views`` when
+PORTFOLIO_ASYNC_VIEWS is on (the default under ``portfolio_site/asgi.py``).
+They share their decorators and page bodies with ``portfolio.views``. The
+ORM, cache and template calls behind a page have no async API worth using
+one by one, since every ``sync_to_async`` hop has a cost of its own. So a
+page body runs in a single worker thread hop, and the decorators take one
+hop each for their cache lookups.
+
+Known trade-off: these views do not make a page faster, and under load they
+serve fewer requests per second than the sync views behind WSGI. Measured
+with ``manage.py benchmark_concurrency`` (300 projects, 40 requests), ASGI
+ran at 0.55-0.98x of WSGI throughput with 1 request in flight and at
+0.68-0.98x with 8, depending on the run. Django's built-in middleware still
+takes one or two thread hops each under ASGI, and all the hops share one
+thread, so page rendering never runs in parallel. Use ASGI for what it
+brings alongside the pages (long-lived connections, async views elsewhere in
+the project), not for page throughput.
+"""
+from asgiref.sync import sync_to_async
+
+from .cache import conditional_by_version
+from .db.router import read_only_database
+from .models import Person
+from .ratelimit import limit_contact_posts
+from .views import (
+    INDEX_MODELS, PROJECT_MODELS, _render_contact, _render_index, _render_project_detail,
+    _render_project_fragment, public_page,
+)
+
+
+@public_page(*INDEX_MODELS)
+async def index(request):
+    return await sync_to_async(_render_index)(request)
+
+
+@public_page(*PROJECT_MODELS)
+async def project_fragment(request):
+    return await sync_to_async(_render_project_fragment)(request)
+
+
+@public_page(*PROJECT_MODELS)
+async def project_detail(request, slug):
+    return await sync_to_async(_render_project_detail)(request, slug)
+
+
+@read_only_database
+@conditional_by_version(Person, vary_on_csrf=True)
+@limit_contact_posts
+async def contact(request):
+    return await sync_to_async(_render_contact)(request)
@@ -0,0 +1,212 @@
+"""Synthetic datasets and request timing for ``manage.py benchmark_portfolio``
+and ``manage.py benchmark_concurrency``.
+
+The dataset is written with ``bulk_create`` so that tens of thousands of rows
+load in seconds; since that bypasses model signals, the search index, the
+category counts, the site-wide stats, the cached cards and the content
+version are refreshed explicitly afterwards and the tables are re-analyzed.
+"""
+import asyncio
+import random
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+from .cache import bump_content_version, bump_object_generation
+from .models import Education, Experience, Person, Project, Skill, Technology, Testimonial
+from .profiling import percentile
+from .search import get_backend
+from .stats import analyze_tables, rebuild_categories, rebuild_stats
+
+CATEGORIES = ['Web', 'Game', 'Mobile', 'Design', 'Data']
+WORDS = (
+    'django python react unity realtime dashboard platform api mobile game engine '
+    'physics shader analytics inventory payment search cache async websocket queue '
+    'design system responsive accessible portfolio client server cloud deploy docker '
+    'testing pipeline machine learning vision audio multiplayer level editor tooling'
+).split()
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def generate_dataset(people=5, projects=500, testimonials=50, skills=30, technologies=40,
+                     technologies_per_project=4, seed=0):
+    """Fill the current database with synthetic portfolio content."""
+    rng = random.Random(seed)
+    with transaction.atomic():
+        skill_rows = Skill.objects.bulk_create(Skill(name=f'Skill {i}') for i in range(skills))
+        tech_rows = Technology.objects.bulk_create(
+            Technology(name=f'{rng.choice(WORDS).title()} {i}') for i in range(technologies)
+        )
+
+        person_rows = Person.objects.bulk_create(
+            Person(name=f'Person {i}', bio=_sentence(rng, 40), order=i) for i in range(people)
+        )
+        Person.skills.through.objects.bulk_create(
+            Person.skills.through(person_id=person.pk, skill_id=skill.pk)
+            for person in person_rows
+            for skill in rng.sample(skill_rows, min(8, len(skill_rows)))
+        )
+        Education.objects.bulk_create(
+            Education(person=person, school=f'School {i}', program=_sentence(rng, 3),
+                      description=_sentence(rng, 20), graduation_year=2010 + i)
+            for person in person_rows for i in range(2)
+        )
+        Experience.objects.bulk_create(
+            Experience(person=person, title=_sentence(rng, 2), company=f'Company {i}',
+                       description=_sentence(rng, 25), start_date=date(2015 + i, 1, 1),
+                       is_current=i == 2)
+            for person in person_rows for i in range(3)
+        )
+
+        project_rows = Project.objects.bulk_create(
+            Project(title=f'{_sentence(rng, 3)[:-1]} {i}', slug=f'synthetic-project-{i}',
+                    description=_sentence(rng, 60), category=rng.choice(CATEGORIES),
+                    link=f'https://example.com/projects/{i}')
+            for i in range(projects)
+        )
+        Project.technologies.through.objects.bulk_create(
+            Project.technologies.through(project_id=project.pk, technology_id=tech.pk)
+            for project in project_rows
+            for tech in rng.sample(tech_rows, min(technologies_per_project, len(tech_rows)))
+        )
+
+        Testimonial.objects.bulk_create(
+            Testimonial(client_name=f'Client {i}', role=f'Company {i}',
+                        quote=_sentence(rng, 30), rating=rng.randint(3, 5))
+            for i in range(testimonials)
+        )
+
+    get_backend().rebuild()
+    rebuild_categories()
+    rebuild_stats()
+    analyze_tables()
+    bump_object_generation(Person, Project)
+    bump_content_version()
+    return {
+        'people': people, 'projects': projects, 'testimonials': testimonials,
+        'skills': skills, 'technologies': technologies,
+        'technologies_per_project': technologies_per_project, 'seed': seed,
+    }
+
+
+def time_request(send, iterations, warmup=0, before_each=None):
+    """Call ``send()`` repeatedly; return latency percentiles (ms) and query counts."""
+    latencies, queries, statuses = [], [], set()
+    for i in range(warmup + iterations):
+        if before_each:
+            before_each()
+        # Public views read through the read-only alias, so count every connection
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(conn)) for conn in connections.all()]
+            start = time.perf_counter()
+            response = send(i)
+            elapsed = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        latencies.append(elapsed)
+        queries.append(sum(len(context) for context in captured))
+        statuses.add(response.status_code)
+
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'status': sorted(statuses),
+        'queries': max(queries),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3),
+    }
+
+
+def _throughput(latencies, statuses, seconds, concurrency):
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'status': sorted(statuses),
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(len(latencies) / seconds, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'max_ms': round(latencies[-1], 3),
+    }
+
+
+def run_threaded(send, requests, concurrency):
+    """Throughput of ``send(i)`` for ``requests`` calls spread over ``concurrency`` threads."""
+    def timed(i):
+        start = time.perf_counter()
+        response = send(i)
+        return (time.perf_counter() - start) * 1000, response.status_code
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(timed, range(requests)))
+        seconds = time.perf_counter() - start
+    return _throughput([ms for ms, _ in results], {status for _, status in results}, seconds, concurrency)
+
+
+def run_async(send, requests, concurrency):
+    """Throughput of ``await send(i)`` for ``requests`` calls, at most ``concurrency`` in flight."""
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await send(i)
+                return (time.perf_counter() - start) * 1000, response.status_code
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(timed(i) for i in range(requests)))
+        return results, time.perf_counter() - start
+
+    results, seconds = asyncio.run(main())
+    return _throughput([ms for ms, _ in results], {status for _, status in results}, seconds, concurrency)
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': dirty}
+
+
+def default_output_path(revision):
+    name = (revision['commit'] or 'unknown')[:12] + ('-dirty' if revision['dirty'] else '')
+    return Path(settings.BASE_DIR) / 'benchmarks' / f'{name}.json'
+
+
+def compare(current, baseline):
+    """Rows of (scenario, metric, baseline, current, change %) for scenarios in both runs."""
+    rows = []
+    for name, result in current['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('queries', 'p50_ms', 'p95_ms'):
+            before, after = previous[metric], result[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            rows.append((name, metric, before, after, change))
+    return rows
@@ -0,0 +1,397 @@
+"""Streaming bulk import and export of portfolio content.
+
+Records are flat dicts tagged with a ``model`` name (``skill``, ``technology``,
+``person``, ``project``, ``testimonial``). Many-to-many fields hold lists of
+names, and a person's ``education`` and ``experiences`` are nested lists of
+dicts. Imports are applied a chunk at a time, one transaction per chunk,
+with a few bulk statements per chunk instead of a query or two per row:
+
+* skills, technologies and projects are upserted on their unique key
+  (``name``, ``name`` and ``slug``) with ``bulk_create(update_conflicts=True)``;
+* people are matched on ``name`` and testimonials on ``client_name`` and
+  ``quote``, since neither has a unique column;
+* M2M links are replaced with plain inserts into the through tables.
+
+Bulk statements skip model signals, so ``finish_import`` refreshes the
+search index, the category counts, the site-wide stats, the cached cards and
+the content version at the end, and has the database re-analyze its tables.
+"""
+import csv
+import json
+from datetime import date, datetime
+from itertools import groupby, islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+
+from .cache import bump_content_version, bump_object_generation
+from .models import Education, Experience, Person, Project, Skill, Technology, Testimonial
+from .search import get_backend
+from .stats import analyze_tables, rebuild_categories, rebuild_stats
+
+# Dependency order: names referenced by people and projects come first
+MODELS = ['skill', 'technology', 'person', 'project', 'testimonial']
+
+FIELDS = {
+    'skill': ['name'],
+    'technology': ['name', 'icon'],
+    'person': [
+        'name', 'bio', 'contact_number', 'email_primary', 'email_secondary', 'facebook',
+        'instagram', 'github', 'linkedin', 'twitter', 'order', 'photo', 'created_at',
+    ],
+    'project': ['title', 'slug', 'description', 'link', 'image', 'category', 'created_at'],
+    'testimonial': ['client_name', 'role', 'quote', 'rating', 'created_at'],
+}
+LIST_FIELDS = {'person': ['skills'], 'project': ['technologies']}
+NESTED_FIELDS = {'person': ['education', 'experiences']}
+EDUCATION_FIELDS = ['school', 'program', 'description', 'graduation_year']
+EXPERIENCE_FIELDS = ['title', 'company', 'description', 'start_date', 'end_date', 'is_current']
+
+# Separator for list values in CSV cells
+CSV_LIST_SEPARATOR = '|'
+
+
+class BulkImportError(ValueError):
+    pass
+
+
+def columns(model):
+    return FIELDS[model] + LIST_FIELDS.get(model, []) + NESTED_FIELDS.get(model, [])
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, 'name') and hasattr(value, 'storage'):  # FieldFile
+        return value.name or ''
+    return value
+
+
+# Export
+
+def export_records(models=None, chunk_size=2000):
+    """Yield one dict per row, model by model, reading ``chunk_size`` rows at a time."""
+    for model in models or MODELS:
+        yield from EXPORTERS[model](chunk_size)
+
+
+def _plain_rows(model_class, model, chunk_size, queryset=None):
+    queryset = queryset if queryset is not None else model_class.objects.order_by('pk')
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        record = {'model': model}
+        record.update({field: _value(getattr(obj, field)) for field in FIELDS[model]})
+        yield obj, record
+
+
+def _export_skills(chunk_size):
+    for _, record in _plain_rows(Skill, 'skill', chunk_size):
+        yield record
+
+
+def _export_technologies(chunk_size):
+    for _, record in _plain_rows(Technology, 'technology', chunk_size):
+        yield record
+
+
+def _export_people(chunk_size):
+    queryset = Person.objects.order_by('pk').prefetch_related('skills', 'education', 'experiences')
+    for person, record in _plain_rows(Person, 'person', chunk_size, queryset):
+        record['skills'] = [skill.name for skill in person.skills.all()]
+        record['education'] = [
+            {field: _value(getattr(row, field)) for field in EDUCATION_FIELDS}
+            for row in person.education.all()
+        ]
+        record['experiences'] = [
+            {field: _value(getattr(row, field)) for field in EXPERIENCE_FIELDS}
+            for row in person.experiences.all()
+        ]
+        yield record
+
+
+def _export_projects(chunk_size):
+    queryset = Project.objects.order_by('pk').prefetch_related('technologies')
+    for project, record in _plain_rows(Project, 'project', chunk_size, queryset):
+        record['technologies'] = [tech.name for tech in project.technologies.all()]
+        yield record
+
+
+def _export_testimonials(chunk_size):
+    for _, record in _plain_rows(Testimonial, 'testimonial', chunk_size):
+        yield record
+
+
+EXPORTERS = {
+    'skill': _export_skills,
+    'technology': _export_technologies,
+    'person': _export_people,
+    'project': _export_projects,
+    'testimonial': _export_testimonials,
+}
+
+
+def write_jsonl(records, stream):
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def write_csv(records, stream, model):
+    writer = csv.DictWriter(stream, fieldnames=columns(model), extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for record in records:
+        row = dict(record)
+        for field in LIST_FIELDS.get(model, []):
+            row[field] = CSV_LIST_SEPARATOR.join(row.get(field, []))
+        for field in NESTED_FIELDS.get(model, []):
+            row[field] = json.dumps(row.get(field, []), ensure_ascii=False)
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+# Import
+
+def read_jsonl(stream, model=None):
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            raise BulkImportError(f'line {number}: {exc}')
+        record.setdefault('model', model)
+        yield record
+
+
+def read_csv(stream, model):
+    for row in csv.DictReader(stream):
+        record = {'model': model}
+        for key, value in row.items():
+            if key in LIST_FIELDS.get(model, []):
+                record[key] = [name for name in value.split(CSV_LIST_SEPARATOR) if name]
+            elif key in NESTED_FIELDS.get(model, []):
+                record[key] = json.loads(value) if value else []
+            else:
+                record[key] = value
+        yield record
+
+
+def _clean(model_class, record, fields):
+    """Model field values from a record: only known keys, blanks dropped for
+    fields that have a default, strings parsed for dates and numbers."""
+    values = {}
+    for name in fields:
+        if name not in record or name == 'created_at':
+            continue
+        value = record[name]
+        field = model_class._meta.get_field(name)
+        if value in ('', None) and (field.has_default() or field.null):
+            values[name] = field.get_default() if not field.null else None
+            continue
+        if isinstance(value, str):
+            internal = field.get_internal_type()
+            if internal == 'DateField':
+                value = parse_date(value)
+            elif internal == 'DateTimeField':
+                value = parse_datetime(value)
+            elif internal in ('IntegerField', 'PositiveIntegerField'):
+                value = int(value)
+            elif internal == 'BooleanField':
+                value = value.strip().lower() in ('1', 'true', 'yes')
+        values[name] = value
+    return values
+
+
+def _created_at(record):
+    value = record.get('created_at')
+    return parse_datetime(value) if isinstance(value, str) and value else value
+
+
+class Importer:
+    """Applies records chunk by chunk; keeps name -> id maps for M2M targets."""
+
+    def __init__(self, chunk_size=2000):
+        self.chunk_size = chunk_size
+        self.counts = dict.fromkeys(MODELS, 0)
+        self._ids = {Skill: {}, Technology: {}}
+
+    def run(self, records):
+        for model, group in groupby(records, key=lambda record: record.get('model')):
+            if model not in MODELS:
+                raise BulkImportError(f'Unknown model {model!r} (expected one of {", ".join(MODELS)})')
+            handler = getattr(self, f'import_{model}')
+            for chunk in _chunks(group, self.chunk_size):
+                with transaction.atomic():
+                    handler(chunk)
+                self.counts[model] += len(chunk)
+        return self.counts
+
+    def _name_ids(self, model_class, names):
+        """Ids for ``names``, creating any that do not exist yet."""
+        known = self._ids[model_class]
+        missing = {name for name in names if name not in known}
+        if missing:
+            model_class.objects.bulk_create(
+                [model_class(name=name) for name in missing], ignore_conflicts=True
+            )
+            known.update(model_class.objects.filter(name__in=missing).values_list('name', 'pk'))
+        return [known[name] for name in names]
+
+    def _set_m2m(self, through, owner_column, target_column, owner_ids, links):
+        """Replace the links of ``owner_ids`` with ``links`` (owner id -> target ids)."""
+        through.objects.filter(**{f'{owner_column}__in': owner_ids}).delete()
+        rows = [
+            (owner, target)
+            for owner, targets in links.items() for target in dict.fromkeys(targets)
+        ]
+        # Plain executemany: building a model instance per link costs more
+        # than the insert itself.
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {quote(through._meta.db_table)} '
+                f'({quote(owner_column)}, {quote(target_column)}) VALUES (%s, %s)',
+                rows,
+            )
+
+    def _restore_created_at(self, model_class, ids_by_key, created):
+        """auto_now_add overwrites created_at on insert; put exported values back."""
+        objs = [
+            model_class(pk=ids_by_key[key], created_at=value)
+            for key, value in created.items() if value and key in ids_by_key
+        ]
+        if objs:
+            model_class.objects.bulk_update(objs, ['created_at'])
+
+    def import_skill(self, chunk):
+        names = [record['name'] for record in chunk if record.get('name')]
+        self._name_ids(Skill, names)
+
+    def import_technology(self, chunk):
+        rows = {record['name']: record for record in chunk if record.get('name')}
+        Technology.objects.bulk_create(
+            [Technology(**_clean(Technology, record, FIELDS['technology'])) for record in rows.values()],
+            update_conflicts=True, unique_fields=['name'], update_fields=['icon', 'updated_at'],
+        )
+        self._ids[Technology].update(
+            Technology.objects.filter(name__in=rows).values_list('name', 'pk')
+        )
+
+    def import_project(self, chunk):
+        rows = {}
+        for record in chunk:
+            slug = record.get('slug') or slugify(record.get('title', ''))
+            if not slug:
+                raise BulkImportError(f'Project without title or slug: {record!r}')
+            rows[slug] = record
+        fields = [field for field in FIELDS['project'] if field not in ('slug', 'created_at')]
+        Project.objects.bulk_create(
+            [Project(**{**_clean(Project, record, fields), 'slug': slug}) for slug, record in rows.items()],
+            update_conflicts=True, unique_fields=['slug'],
+            update_fields=[*{field for record in rows.values() for field in fields if field in record}, 'updated_at'],
+        )
+        ids = dict(Project.objects.filter(slug__in=rows).values_list('slug', 'pk'))
+        self._restore_created_at(Project, ids, {slug: _created_at(record) for slug, record in rows.items()})
+
+        linked = {slug: record['technologies'] for slug, record in rows.items() if 'technologies' in record}
+        if linked:
+            self._set_m2m(
+                Project.technologies.through, 'project_id', 'technology_id',
+                [ids[slug] for slug in linked],
+                {ids[slug]: self._name_ids(Technology, names) for slug, names in linked.items()},
+            )
+
+    def import_person(self, chunk):
+        rows = {record['name']: record for record in chunk if record.get('name')}
+        existing = {}
+        for pk, name in Person.objects.filter(name__in=rows).order_by('pk').values_list('pk', 'name'):
+            existing.setdefault(name, pk)
+
+        fields = [field for field in FIELDS['person'] if field != 'created_at']
+        new, changed, update_fields = [], [], {'updated_at'}
+        now = timezone.now()
+        for name, record in rows.items():
+            values = _clean(Person, record, fields)
+            if name in existing:
+                # bulk_update skips auto_now, so updated_at is set by hand
+                changed.append(Person(pk=existing[name], updated_at=now, **values))
+                update_fields.update(values)
+            else:
+                new.append(Person(**values))
+        Person.objects.bulk_create(new)
+        if changed:
+            Person.objects.bulk_update(changed, update_fields)
+
+        ids = {}
+        for pk, name in Person.objects.filter(name__in=rows).order_by('pk').values_list('pk', 'name'):
+            ids.setdefault(name, pk)
+        self._restore_created_at(Person, ids, {name: _created_at(record) for name, record in rows.items()})
+
+        linked = {name: record['skills'] for name, record in rows.items() if 'skills' in record}
+        if linked:
+            self._set_m2m(
+                Person.skills.through, 'person_id', 'skill_id',
+                [ids[name] for name in linked],
+                {ids[name]: self._name_ids(Skill, names) for name, names in linked.items()},
+            )
+        for key, model_class, nested_fields in (
+            ('education', Education, EDUCATION_FIELDS),
+            ('experiences', Experience, EXPERIENCE_FIELDS),
+        ):
+            owners = {name: record[key] for name, record in rows.items() if key in record}
+            if not owners:
+                continue
+            model_class.objects.filter(person_id__in=[ids[name] for name in owners]).delete()
+            model_class.objects.bulk_create(
+                model_class(person_id=ids[name], **_clean(model_class, item, nested_fields))
+                for name, items in owners.items() for item in items
+            )
+
+    def import_testimonial(self, chunk):
+        rows = {(record['client_name'], record['quote']): record for record in chunk}
+        existing = {
+            (client_name, quote): pk for pk, client_name, quote in
+            Testimonial.objects.filter(client_name__in={key[0] for key in rows})
+            .values_list('pk', 'client_name', 'quote')
+        }
+        fields = [field for field in FIELDS['testimonial'] if field != 'created_at']
+        new, changed, update_fields = [], [], {'updated_at'}
+        now = timezone.now()
+        for key, record in rows.items():
+            values = _clean(Testimonial, record, fields)
+            if key in existing:
+                changed.append(Testimonial(pk=existing[key], updated_at=now, **values))
+                update_fields.update(values)
+            else:
+                new.append(Testimonial(**values))
+        Testimonial.objects.bulk_create(new)
+        if changed:
+            Testimonial.objects.bulk_update(changed, update_fields)
+
+        ids = {
+            (client_name, quote): pk for pk, client_name, quote in
+            Testimonial.objects.filter(client_name__in={key[0] for key in rows})
+            .values_list('pk', 'client_name', 'quote')
+        }
+        self._restore_created_at(Testimonial, ids, {key: _created_at(record) for key, record in rows.items()})
+
+
+def finish_import():
+    """Refresh everything bulk statements bypass the signals for."""
+    get_backend().rebuild()
+    rebuild_categories()
+    rebuild_stats()
+    analyze_tables()
+    bump_object_generation(Person, Project)
+    bump_content_version()
@@ -0,0 +1,269 @@
+"""Content-versioned caching for the public pages.
+
+A single "content version" number lives in the cache. Model signals bump it
+after every committed edit (see ``portfolio.signals``), and every cached page
+is keyed on the version that was current when it was rendered, so an edit
+makes all older entries unreachable instead of having to find and delete them.
+
+Cards rendered once per person or project are also cached as template
+fragments, keyed on a version kept per object. Those versions are bumped only
+for the rows an edit touches, so after a change the page re-renders the
+affected cards and takes every other card from the cache. Changes that skip
+the signals (bulk imports, generated data) bump a generation kept per model
+instead, which is part of every object version of that model.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .compress import ENCODING_SUFFIXES, SUPPORTED_ENCODINGS, negotiate_encoding, precompressed_variants
+
+CONTENT_VERSION_KEY = 'portfolio:content-version'
+
+
+def get_cache():
+    return caches[getattr(settings, 'PORTFOLIO_CACHE_ALIAS', 'default')]
+
+
+def _initial_version():
+    # Seeded from the clock so a version lost to eviction or a cache restart
+    # never comes back with a number that older entries were stored under.
+    return int(time.time() * 1000)
+
+
+def get_content_version():
+    cache = get_cache()
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, _initial_version(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def _bump(key):
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, None)
+        return version
+
+
+def bump_content_version():
+    return _bump(CONTENT_VERSION_KEY)
+
+
+def object_version_key(model, pk):
+    return f'portfolio:object-version:{model._meta.label_lower}:{pk}'
+
+
+def object_generation_key(model):
+    return f'portfolio:object-generation:{model._meta.label_lower}'
+
+
+def get_object_versions(model, pks):
+    """Per-object versions for ``pks`` in one cache round trip, seeding missing ones.
+
+    Each version is ``"<generation>.<object version>"``, so bumping the
+    model's generation changes all of them at once.
+    """
+    cache = get_cache()
+    generation_key = object_generation_key(model)
+    keys = {object_version_key(model, pk): pk for pk in pks}
+    versions = cache.get_many([generation_key, *keys])
+    for key in {generation_key, *keys} - versions.keys():
+        # add() so a bump that lands in between is not overwritten
+        version = _initial_version()
+        versions[key] = version if cache.add(key, version, None) else cache.get(key, version)
+    generation = versions[generation_key]
+    return {pk: f'{generation}.{versions[key]}' for key, pk in keys.items()}
+
+
+def bump_object_versions(model, pks):
+    for pk in pks:
+        _bump(object_version_key(model, pk))
+
+
+def bump_object_generation(*models):
+    """Change every object version of ``models``, for writes made without signals."""
+    for model in models:
+        _bump(object_generation_key(model))
+
+
+def fragment_cache_timeout():
+    return getattr(settings, 'PORTFOLIO_FRAGMENT_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+
+def attach_fragment_versions(objects):
+    """Set ``fragment_version`` on each object, for ``{% cache %}`` keys in templates."""
+    objects = list(objects)
+    if objects:
+        versions = get_object_versions(type(objects[0]), [obj.pk for obj in objects])
+        for obj in objects:
+            obj.fragment_version = versions[obj.pk]
+    return objects
+
+
+def page_cache_key(request, version=None):
+    if version is None:
+        version = get_content_version()
+    url = hashlib.md5(request.build_absolute_uri().encode('utf-8')).hexdigest()
+    return f'portfolio:page:{version}:{url}'
+
+
+def compressed_response(request, content, headers, variants):
+    """``content``, or the variant of it the client accepts best, as a response."""
+    encoding = negotiate_encoding(request, {coding for coding, suffix in ENCODING_SUFFIXES.items() if suffix in variants})
+    if encoding is None:
+        response = HttpResponse(content, headers=headers)
+    else:
+        response = HttpResponse(variants[ENCODING_SUFFIXES[encoding]], headers=headers)
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def _cached_page(request):
+    key = page_cache_key(request)
+    return key, get_cache().get(key)
+
+
+def _store_page(key, request, response):
+    if response.status_code != 200 or response.streaming or response.has_header('Content-Encoding'):
+        return response
+    headers = dict(response.items())
+    variants = precompressed_variants('.html', response.content)
+    timeout = getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+    get_cache().set(key, (response.content, headers, variants), timeout)
+    return compressed_response(request, response.content, headers, variants)
+
+
+def cache_page_by_version(view_func):
+    """Cache successful GET/HEAD responses until the content version changes.
+
+    Compressed variants are made once, when the page is stored, and served to
+    clients whose Accept-Encoding allows them. Works on sync and async views;
+    for async ones the cache lookups and compression run in a worker thread.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+
+            # One worker thread hop for the version and the page lookup
+            key, cached = await sync_to_async(_cached_page)(request)
+            if cached is not None:
+                return compressed_response(request, *cached)
+
+            response = await view_func(request, *args, **kwargs)
+            return await sync_to_async(_store_page)(key, request, response)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view_func(request, *args, **kwargs)
+
+        key, cached = _cached_page(request)
+        if cached is not None:
+            return compressed_response(request, *cached)
+
+        response = view_func(request, *args, **kwargs)
+        return _store_page(key, request, response)
+    return wrapper
+
+
+def mark_deleted(model):
+    """Remember when rows of ``model`` were last deleted.
+
+    Deletes leave no ``updated_at`` behind, so without this a page could keep
+    reporting the Last-Modified of rows that still exist.
+    """
+    get_cache().set(f'portfolio:deleted-at:{model._meta.label_lower}', time.time(), None)
+
+
+def content_last_modified(models):
+    """Newest modification time across ``models``, cached per content version."""
+    cache = get_cache()
+    labels = sorted(model._meta.label_lower for model in models)
+    key = f'portfolio:last-modified:{get_content_version()}:{",".join(labels)}'
+    timestamp = cache.get(key)
+    if timestamp is None:
+        stamps = [
+            model.objects.order_by().aggregate(latest=Max('updated_at'))['latest']
+            for model in models
+        ]
+        timestamp = max((stamp.timestamp() for stamp in stamps if stamp), default=0)
+        cache.set(key, timestamp, getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24))
+    deleted = cache.get_many([f'portfolio:deleted-at:{label}' for label in labels]).values()
+    timestamp = max([timestamp, *deleted])
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp else None
+
+
+def conditional_by_version(*models, vary_on_csrf=False):
+    """Send ETag/Last-Modified headers and answer revalidation with a 304.
+
+    The ETag is derived from the content version and the request URL, so it
+    changes exactly when the cached page would. ``vary_on_csrf`` folds the CSRF
+    cookie in for pages that embed a token.
+    """
+    def etag(request, version, encoding):
+        # The encoding is part of the tag: gzip and identity bodies differ byte for byte.
+        parts = [str(version), request.build_absolute_uri(), encoding]
+        if vary_on_csrf:
+            parts.append(request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''))
+        return quote_etag(hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest())
+
+    def validators(request):
+        # Same values django.views.decorators.http.condition computes, for the
+        # encoding the client would be sent
+        version = get_content_version()
+        res_etag = etag(request, version, negotiate_encoding(request, SUPPORTED_ENCODINGS) or 'identity')
+        res_last_modified = content_last_modified(models)
+        return version, res_etag, int(res_last_modified.timestamp()) if res_last_modified else None
+
+    def set_validators(request, response, version, res_etag, res_last_modified):
+        # Unlike condition(), only a page (or the 304 standing in for it) gets
+        # them, so a 404 or an error page is never revalidated as the page.
+        if request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304):
+            return response
+        if response.status_code == 200:
+            # Tag the bytes actually sent: a streamed or small body goes out
+            # uncompressed whatever the client accepts.
+            res_etag = etag(request, version, response.get('Content-Encoding', 'identity'))
+        if res_last_modified and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(res_last_modified)
+        response.headers.setdefault('ETag', res_etag)
+        return response
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                version, res_etag, res_last_modified = await sync_to_async(validators)(request)
+                response = get_conditional_response(request, etag=res_etag, last_modified=res_last_modified)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return set_validators(request, response, version, res_etag, res_last_modified)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            version, res_etag, res_last_modified = validators(request)
+            response = get_conditional_response(request, etag=res_etag, last_modified=res_last_modified)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return set_validators(request, response, version, res_etag, res_last_modified)
+        return wrapper
+    return decorator
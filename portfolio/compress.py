@@ -0,0 +1,142 @@
+"""Minification and precompression helpers.
+
+The minifiers are deliberately conservative: they only drop comments and
+whitespace that cannot change rendering or behaviour, so they are safe to run
+over anything the templates produce. Brotli is used when the optional
+``brotli`` package is installed; gzip comes from the standard library.
+"""
+import gzip
+import re
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Below this size compression headers cost more than they save
+MIN_COMPRESS_SIZE = 200
+
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.xml')
+
+_RAW_BLOCK_RE = re.compile(rb'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_HTML_COMMENT_RE = re.compile(rb'<!--(?!\[if).*?-->', re.DOTALL)
+# A whole tag; quoted attribute values may contain '>'
+_HTML_TAG_RE = re.compile(rb'<(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+_LINE_BREAK_RUN_RE = re.compile(rb'[ \t\r]*\n\s*')
+_SPACE_RUN_RE = re.compile(rb'[ \t]{2,}')
+
+_CSS_COMMENT_RE = re.compile(rb'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(rb'\s+')
+_CSS_PUNCT_RE = re.compile(rb'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(rb':\s+')
+
+_JS_COMMENT_LINE_RE = re.compile(rb'^[ \t]*//[^\n]*\n', re.MULTILINE)
+_JS_INDENT_RE = re.compile(rb'^[ \t]+|[ \t]+$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(rb'\n{2,}')
+
+
+def minify_css(data):
+    data = _CSS_COMMENT_RE.sub(b'', data)
+    data = _CSS_SPACE_RE.sub(b' ', data)
+    data = _CSS_PUNCT_RE.sub(rb'\1', data)
+    data = _CSS_COLON_RE.sub(b':', data)
+    return data.replace(b';}', b'}').strip()
+
+
+def minify_js(data):
+    # Only whole-line comments and indentation: anything smarter needs a parser.
+    data = _JS_COMMENT_LINE_RE.sub(b'', data)
+    data = _JS_INDENT_RE.sub(b'', data)
+    return _BLANK_LINES_RE.sub(b'\n', data).strip()
+
+
+def _collapse_whitespace(text):
+    text = _LINE_BREAK_RUN_RE.sub(b'\n', text)
+    return _SPACE_RUN_RE.sub(b' ', text)
+
+
+def _minify_html_text(data):
+    # Whitespace is collapsed in the text between tags only: inside a tag it
+    # may be part of an attribute value (title, alt, data-*).
+    data = _HTML_COMMENT_RE.sub(b'', data)
+    parts = []
+    position = 0
+    for match in _HTML_TAG_RE.finditer(data):
+        parts.append(_collapse_whitespace(data[position:match.start()]))
+        parts.append(match.group())
+        position = match.end()
+    parts.append(_collapse_whitespace(data[position:]))
+    return b''.join(parts)
+
+
+def minify_html(data):
+    """Collapse whitespace in text outside <pre>/<textarea>; minify inline <script>/<style>."""
+    parts = []
+    position = 0
+    for match in _RAW_BLOCK_RE.finditer(data):
+        parts.append(_minify_html_text(data[position:match.start()]))
+        tag = match.group(2).lower()
+        body = match.group(3)
+        if tag == b'script':
+            body = minify_js(body)
+        elif tag == b'style':
+            body = minify_css(body)
+        parts.append(match.group(1) + body + match.group(4))
+        position = match.end()
+    parts.append(_minify_html_text(data[position:]))
+    return b''.join(parts).strip() + b'\n'
+
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+def minify(name, data):
+    """Minify ``data`` according to the extension of ``name``; other types pass through."""
+    for extension, minifier in MINIFIERS.items():
+        if name.endswith(extension):
+            return minifier(data)
+    return data
+
+
+def gzip_bytes(data):
+    # mtime=0 keeps the output byte-identical across runs
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompressed_variants(name, data):
+    """Map of sidecar suffix to compressed bytes worth serving for ``name``."""
+    if not name.endswith(COMPRESSIBLE_EXTENSIONS) or len(data) < MIN_COMPRESS_SIZE:
+        return {}
+    variants = {'.gz': gzip_bytes(data)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    return variants
+
+
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+# Codings precompressed_variants can produce here
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(request, available):
+    """Best content-coding from ``available`` that the client accepts, or None."""
+    accepted = {}
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+    for coding in ('br', 'gzip'):
+        if coding in available and accepted.get(coding, accepted.get('*', 0.0)) > 0:
+            return coding
+    return None
@@ -0,0 +1,8 @@
+"""SQLite tuned for a read-heavy site.
+
+``ENGINE: 'portfolio.db'`` is Django's sqlite3 backend plus a set of pragmas
+applied to every new connection (a memory map, a larger page cache and a busy
+timeout, with WAL journaling and relaxed fsync as an opt-in). A second alias
+opened with ``read_only`` serves the public pages, so their reads never take a
+write lock; see ``portfolio.db.router``.
+"""
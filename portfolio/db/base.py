@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from django.db.backends.sqlite3 import base
+
+# Applied in this order to every new connection; override with OPTIONS['pragmas']
+DEFAULT_PRAGMAS = {
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative values are KiB: 64 MB of page cache per connection
+    'cache_size': -64 * 1024,
+    # Milliseconds to wait on a locked database before raising "database is locked"
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+# Added with OPTIONS['wal']
+WAL_PRAGMAS = {
+    # Readers no longer block the writer and vice versa. The mode is stored in
+    # the database file, so read-only connections skip it.
+    'journal_mode': 'WAL',
+    # In WAL mode NORMAL stays consistent after a crash; only the last commits
+    # before a power loss can be lost
+    'synchronous': 'NORMAL',
+}
+
+
+def _is_plain_path(name):
+    name = str(name)
+    return name != ':memory:' and not name.startswith('file:')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """sqlite3 backend with tuned pragmas and optional read-only connections.
+
+    Extra OPTIONS, removed before they reach ``sqlite3.connect()``:
+
+    ``wal``
+        Switch the file to write-ahead logging (WAL_PRAGMAS). Off by default:
+        the mode is written into the database file, and stays there.
+    ``pragmas``
+        Pragmas to set on top of DEFAULT_PRAGMAS (``None`` drops one).
+    ``read_only``
+        Open the file with ``mode=ro``, or set ``query_only`` for in-memory
+        and URI databases such as the test database.
+    """
+
+    def get_connection_params(self):
+        options = self.settings_dict['OPTIONS']
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('read_only', None)
+        params.pop('wal', None)
+        if options.get('read_only') and _is_plain_path(params['database']):
+            params['database'] = Path(params['database']).resolve().as_uri() + '?mode=ro'
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas().items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def pragmas(self):
+        options = self.settings_dict['OPTIONS']
+        pragmas = {**DEFAULT_PRAGMAS, **(WAL_PRAGMAS if options.get('wal') else {}), **options.get('pragmas', {})}
+        if options.get('read_only'):
+            pragmas.pop('journal_mode', None)
+            pragmas['query_only'] = 'ON'
+        return {name: value for name, value in pragmas.items() if value is not None}
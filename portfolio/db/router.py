@@ -0,0 +1,58 @@
+"""Send the public pages' reads to the read-only database alias.
+
+Views wrapped in ``read_only_database`` read through PORTFOLIO_READ_DATABASE
+for the duration of the request; everything else, and every write, uses the
+default alias. A context variable marks the request, so the routing also
+follows async views into the threads their queries run in.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_reading = ContextVar('portfolio_read_only', default=False)
+
+
+def read_alias():
+    """The read-only alias, or None when it is not configured."""
+    alias = getattr(settings, 'PORTFOLIO_READ_DATABASE', None)
+    return alias if alias and alias in connections else None
+
+
+def read_only_database(view_func):
+    """Route the view's reads to the read-only alias."""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _reading.set(True)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _reading.reset(token)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        token = _reading.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _reading.reset(token)
+    return wrapper
+
+
+class ReadOnlyRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias() if _reading.get() else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases point at the same database file
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != read_alias()
@@ -0,0 +1,439 @@
+"""Static site export for GitHub Pages.
+
+Pages are rendered through the Django test client by a pool of worker threads,
+passed through a pipeline of byte-level stages (link rewriting first) and only
+written when their content hash differs from the previous export. Assets are
+synced the same way against a manifest, so an export after a small edit
+touches a handful of files instead of rebuilding ``docs/`` from scratch.
+
+Static assets come from ``collectstatic``: pages are rendered with DEBUG off
+so templates link the content-hashed names from the staticfiles manifest.
+Only the static and media files that the exported pages link to are
+published. Text output is minified and gets precompressed ``.gz`` (and
+``.br`` when brotli is installed) siblings; a page whose bytes duplicate an
+earlier page is written as a small redirect to it instead.
+
+The project search index (``search-index.json``) is exported too, with its
+project URLs pointing at the exported pages, so ``static/js/main.js`` can
+search and filter the static site in the browser.
+
+Every rendered page also goes through the ``portfolio.a11y`` checks while it
+is still in memory; findings are kept in the manifest by content hash, so
+unchanged pages are not parsed again.
+"""
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from .a11y import Finding, scan_html
+from .compress import minify, minify_html, precompressed_variants
+from .models import Project
+from .pagination import paginate_keyset
+
+MANIFEST_NAME = '.export-manifest.json'
+SIDECAR_SUFFIXES = ('.gz', '.br')
+CSS_URL_RE = re.compile(r'''url\(\s*['"]?([^'")]+?)['"]?\s*\)''')
+
+DUPLICATE_PAGE_TEMPLATE = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Redirecting…</title>
+<link rel="canonical" href="{href}">
+<meta http-equiv="refresh" content="0; url={href}">
+</head>
+<body><a href="{href}">Continue</a></body>
+</html>
+"""
+
+
+@dataclass
+class Page:
+    url: str
+    path: str
+    # Page whose location relative links are resolved against, for fragments
+    # that are inserted into another page rather than opened directly.
+    link_base: str = ''
+
+
+@dataclass
+class PageResult:
+    page: Page
+    seconds: float
+    written: bool
+
+
+@dataclass
+class ExportReport:
+    pages: list = field(default_factory=list)
+    assets_copied: int = 0
+    assets_unchanged: int = 0
+    removed: list = field(default_factory=list)
+    seconds: float = 0.0
+    # Page path -> accessibility findings, and how many pages were parsed
+    # for them rather than answered from the manifest
+    a11y: dict = field(default_factory=dict)
+    a11y_scanned: int = 0
+
+    @property
+    def pages_written(self):
+        return sum(1 for result in self.pages if result.written)
+
+
+def site_pages():
+    """Every page of the exported site, with its path under the output folder."""
+    # '/' and '/portfolio/' share the URL name 'index', so spell them out.
+    yield Page('/', 'index.html')
+    yield Page('/portfolio/', 'portfolio.html')
+    yield Page(reverse('portfolio:contact'), 'contact.html')
+    yield Page(reverse('portfolio:search_index'), 'search-index.json', 'index.html')
+    for slug in Project.objects.order_by().values_list('slug', flat=True).iterator():
+        yield Page(reverse('portfolio:project_detail', kwargs={'slug': slug}), f'projects/{slug}.html')
+
+    # Infinite-scroll fragments following the first index page, so the
+    # exported site can load every project without a server.
+    fragment_url = reverse('portfolio:project_fragment')
+    cursor = paginate_keyset(Project.objects.only('pk', 'created_at'), '').next_cursor
+    number = 2
+    while cursor:
+        yield Page(f"{fragment_url}?{urlencode({'cursor': cursor})}", f'fragments/projects-{number}.html', 'index.html')
+        cursor = paginate_keyset(Project.objects.only('pk', 'created_at'), cursor).next_cursor
+        number += 1
+
+
+class LinkRewriter:
+    """Export stage turning site-absolute URLs into relative links between exported files.
+
+    One compiled pattern finds every URL-bearing attribute, ``srcset`` lists
+    included, and the CSRF field, which is useless without a server and would
+    make every export differ.
+    Each URL is resolved through the map of exported pages, so
+    ``/project/<slug>/`` becomes ``projects/<slug>.html`` relative to the page
+    being written; ``/static/`` and ``/media/`` paths keep their layout.
+    Query-only links, like the "Load more" fallback's ``?cursor=``, need the
+    server to page and are dropped; the script loads the exported fragments.
+    """
+    pattern = re.compile(
+        rb'(?P<csrf><input type="hidden" name="csrfmiddlewaretoken" value="[^"]*">)'
+        rb'|(?P<attr>\b(?:href|src|action|data-fragment-url|data-search-index)=")(?P<url>/[^"]*)"'
+        rb'|(?P<srcset_attr>\bsrcset=")(?P<srcset>[^"]*)"'
+        rb'|(?P<query_href>\shref="\?[^"]*")'
+    )
+    passthrough_prefixes = ('/static/', '/media/')
+
+    def __init__(self, pages):
+        self.url_map = {page.url: page.path for page in pages}
+        # Output paths of every /static/ and /media/ file the pages link to
+        self.referenced = set()
+
+    def resolve(self, url, page_path):
+        """Relative replacement for ``url`` on ``page_path``, or None to leave it alone."""
+        if url.startswith('//'):
+            return None
+        url, hash_sign, fragment = url.partition('#')
+        target = self.url_map.get(url)
+        if target is None:
+            path, _, query = url.partition('?')
+            target = self.url_map.get(path)
+            if target is None and path.startswith(self.passthrough_prefixes):
+                self.referenced.add(path[1:])
+                target = path[1:] + ('?' + query if query else '')
+        if target is None:
+            return None
+        relative = posixpath.relpath(target, posixpath.dirname(page_path) or '.')
+        if not relative.startswith('.'):
+            relative = './' + relative
+        return relative + hash_sign + fragment
+
+    def rewrite_srcset(self, srcset, page_path):
+        candidates = []
+        for candidate in srcset.split(','):
+            url, _, descriptor = candidate.strip().partition(' ')
+            if url.startswith('/'):
+                url = self.resolve(url, page_path) or url
+            candidates.append(f'{url} {descriptor}'.strip())
+        return ', '.join(candidates)
+
+    def __call__(self, page, content):
+        def replace(match):
+            if match.group('csrf') or match.group('query_href'):
+                return b''
+            if match.group('srcset_attr'):
+                srcset = html.unescape(match.group('srcset').decode('utf-8'))
+                srcset = self.rewrite_srcset(srcset, page.link_base or page.path)
+                return match.group('srcset_attr') + html.escape(srcset).encode('utf-8') + b'"'
+            url = html.unescape(match.group('url').decode('utf-8'))
+            resolved = self.resolve(url, page.link_base or page.path)
+            if resolved is None:
+                return match.group(0)
+            return match.group('attr') + html.escape(resolved).encode('utf-8') + b'"'
+        return self.pattern.sub(replace, content)
+
+    def rewrite_search_index(self, page, content):
+        """Point the project URLs in the search index at the exported pages."""
+        index = json.loads(content)
+        for project in index['projects']:
+            project['url'] = self.resolve(project['url'], page.link_base or page.path) or project['url']
+        return json.dumps(index, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_atomic(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_with_sidecars(path, data):
+    """Write ``data`` plus its precompressed siblings, dropping outdated ones."""
+    write_atomic(path, data)
+    variants = precompressed_variants(path.name, data)
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = path.with_name(path.name + suffix)
+        if suffix in variants:
+            write_atomic(sidecar, variants[suffix])
+        elif sidecar.exists():
+            sidecar.unlink()
+
+
+def minify_page(page, content):
+    return minify_html(content)
+
+
+class AccessibilityCheck:
+    """Export stage running the accessibility checks on each finished page.
+
+    Results are cached by content hash (``load``/``entries`` round-trip them
+    through the export manifest), so a page whose bytes did not change since
+    the last export is not parsed again. Content passes through untouched.
+    """
+
+    def __init__(self):
+        self.findings = {}
+        self.scanned = 0
+        self._cache = {}
+        self._used = set()
+        self._lock = threading.Lock()
+
+    def load(self, entries):
+        self._cache = dict(entries)
+
+    def entries(self):
+        """Cache entries for the pages of this export, for the manifest."""
+        return {key: self._cache[key] for key in self._used}
+
+    def __call__(self, page, content):
+        # Fragments are checked without the whole-document rules
+        fragment = bool(page.link_base)
+        key = sha256(content) + ('-fragment' if fragment else '')
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            cached = [list(finding) for finding in scan_html(content, fragment=fragment)]
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = cached
+                self.scanned += 1
+            self._used.add(key)
+            if cached:
+                self.findings[page.path] = [Finding(*finding) for finding in cached]
+        return content
+
+
+class StaticExporter:
+    def __init__(self, output_dir='docs', workers=None, force=False, minify=True, a11y=True):
+        self.output_dir = Path(output_dir)
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 2)
+        self.force = force
+        self.minify = minify
+        self._local = threading.local()
+        self.a11y = AccessibilityCheck() if a11y else None
+        # Callables taking (page, content) and returning new content, applied to
+        # HTML pages in order after link rewriting, before each is hashed and written.
+        self.stages = [minify_page] if minify else []
+        if self.a11y:
+            self.stages.append(self.a11y)
+        self._pipelines = {}
+
+    # Manifest
+
+    def load_manifest(self):
+        path = self.output_dir / MANIFEST_NAME
+        empty = {'pages': {}, 'assets': {}, 'a11y': {}}
+        if self.force or not path.exists():
+            return empty
+        try:
+            manifest = json.loads(path.read_text(encoding='utf-8'))
+        except ValueError:
+            return empty
+        if manifest.get('minify', True) != self.minify:
+            return empty
+        for key, value in empty.items():
+            manifest.setdefault(key, value)
+        return manifest
+
+    def save_manifest(self, manifest):
+        data = json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8')
+        write_atomic(self.output_dir / MANIFEST_NAME, data)
+
+    # Pages
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client()
+        return client
+
+    def render(self, page):
+        started = time.perf_counter()
+        response = self._client().get(page.url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{page.url} returned HTTP {response.status_code}')
+        content = response.content
+        for stage in self._pipelines[posixpath.splitext(page.path)[1]]:
+            content = stage(page, content)
+        return page, content, time.perf_counter() - started
+
+    def export_pages(self, previous, report):
+        hashes = {}
+        first_page_with = {}
+        pages = list(site_pages())
+        self.rewriter = LinkRewriter(pages)
+        self._pipelines = {
+            '.html': [self.rewriter, *self.stages],
+            '.json': [self.rewriter.rewrite_search_index],
+        }
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for page, content, seconds in pool.map(self.render, pages):
+                digest = sha256(content)
+                original = first_page_with.setdefault(digest, page.path)
+                if original != page.path:
+                    href = posixpath.relpath(original, posixpath.dirname(page.path) or '.')
+                    content = DUPLICATE_PAGE_TEMPLATE.format(href=html.escape(href)).encode('utf-8')
+                    digest = sha256(content)
+                target = self.output_dir / page.path
+                written = previous.get(page.path) != digest or not target.exists()
+                if written:
+                    write_with_sidecars(target, content)
+                hashes[page.path] = digest
+                report.pages.append(PageResult(page, seconds, written))
+        return hashes
+
+    # Assets
+
+    def sync_files(self, source, names, prefix, previous, report):
+        """Copy changed files ``names`` (relative to ``source``) to ``<output>/<prefix>``.
+
+        Entries in the manifest carry the size and mtime the hash was taken
+        at, so unchanged files are skipped without being read.
+        """
+        entries = {}
+        source = Path(source)
+        for name in names:
+            src = source / name
+            rel = f'{prefix}/{name}'
+            stat = src.stat()
+            old = previous.get(rel)
+            if old and old['size'] == stat.st_size and old['mtime'] == stat.st_mtime_ns:
+                digest = old['sha256']
+            else:
+                digest = sha256(src.read_bytes())
+            target = self.output_dir / rel
+            if old and old['sha256'] == digest and target.exists():
+                report.assets_unchanged += 1
+            else:
+                data = src.read_bytes()
+                if self.minify:
+                    data = minify(rel, data)
+                write_with_sidecars(target, data)
+                report.assets_copied += 1
+            entries[rel] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': digest}
+        return entries
+
+    def collect_static(self):
+        """Run collectstatic so pages can link the content-hashed asset names."""
+        # Runs on the shared staticfiles_storage, which picks up the new manifest.
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def referenced_files(self, prefix, root):
+        """Files under ``root`` that exported pages link to as ``<prefix>/...``.
+
+        Stylesheets are followed one level for relative ``url()`` references.
+        """
+        root = Path(root)
+        names = set()
+        pending = [rel[len(prefix) + 1:] for rel in self.rewriter.referenced if rel.startswith(prefix + '/')]
+        while pending:
+            name = pending.pop()
+            if name in names or not (root / name).is_file():
+                continue
+            names.add(name)
+            if name.endswith('.css'):
+                css = (root / name).read_text(encoding='utf-8', errors='replace')
+                for ref in CSS_URL_RE.findall(css):
+                    if not ref.startswith(('/', 'data:', 'http:', 'https:', '#')):
+                        pending.append(posixpath.normpath(posixpath.join(posixpath.dirname(name), ref.split('?')[0].split('#')[0])))
+        return sorted(names)
+
+    def export_assets(self, previous, report):
+        # Only files the pages actually link to are published: the hashed
+        # static names from the manifest and the media in use.
+        assets = self.sync_files(
+            settings.STATIC_ROOT, self.referenced_files('static', settings.STATIC_ROOT), 'static', previous, report,
+        )
+        assets.update(self.sync_files(
+            settings.MEDIA_ROOT, self.referenced_files('media', settings.MEDIA_ROOT), 'media', previous, report,
+        ))
+        return assets
+
+    def remove_stale(self, previous, current, report):
+        for rel in sorted(set(previous) - set(current)):
+            target = self.output_dir / rel
+            for path in (target, *(target.with_name(target.name + suffix) for suffix in SIDECAR_SUFFIXES)):
+                if path.exists():
+                    path.unlink()
+            report.removed.append(rel)
+
+    def export(self):
+        started = time.perf_counter()
+        report = ExportReport()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest()
+
+        self.collect_static()
+        if self.a11y:
+            self.a11y.load(manifest['a11y'])
+        with override_settings(DEBUG=False):
+            pages = self.export_pages(manifest['pages'], report)
+        assets = self.export_assets(manifest['assets'], report)
+        self.remove_stale(manifest['pages'], pages, report)
+        self.remove_stale(manifest['assets'], assets, report)
+
+        self.save_manifest({
+            'minify': self.minify, 'pages': pages, 'assets': assets,
+            'a11y': self.a11y.entries() if self.a11y else {},
+        })
+        if self.a11y:
+            report.a11y = dict(sorted(self.a11y.findings.items()))
+            report.a11y_scanned = self.a11y.scanned
+        report.seconds = time.perf_counter() - started
+        return report
@@ -0,0 +1,126 @@
+"""Responsive image derivatives for uploaded photos.
+
+Each source image is resized to the configured widths and saved as WebP and
+JPEG under ``derived/`` in the media storage. Derivative names are built from
+a hash of the source bytes, so re-uploading the same picture reuses them and
+a changed picture never collides with stale files. Derivatives are generated
+when an image is uploaded (see ``portfolio.signals``) or lazily the first time
+a template asks for them.
+"""
+import hashlib
+import io
+import logging
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+DERIVED_DIR = 'derived'
+FORMATS = (
+    # (extension, Pillow format, MIME type, save options)
+    ('webp', 'WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+
+@dataclass
+class Derivative:
+    url: str
+    width: int
+
+
+@dataclass
+class ResponsiveImage:
+    """Derivative URLs for one source image, by MIME type, smallest first."""
+    sources: dict
+    width: int
+    height: int
+
+    def srcset(self, mime_type):
+        return ', '.join(f'{item.url} {item.width}w' for item in self.sources[mime_type])
+
+    @property
+    def fallback(self):
+        """JPEG for browsers without srcset: the largest one up to 640px wide."""
+        items = self.sources['image/jpeg']
+        return ([item for item in items if item.width <= 640] or items[:1])[-1]
+
+
+def get_widths():
+    return tuple(sorted(getattr(settings, 'PORTFOLIO_IMAGE_WIDTHS', (320, 640, 960, 1280))))
+
+
+def _target_widths(original_width):
+    widths = [width for width in get_widths() if width < original_width]
+    return widths + [original_width]
+
+
+def _derived_name(digest, width, extension):
+    return f'{DERIVED_DIR}/{digest[:2]}/{digest}-{width}.{extension}'
+
+
+def _encode(image, width, pil_format, options):
+    if image.width != width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+    if pil_format == 'JPEG' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def generate_derivatives(field_file):
+    """Create any missing derivatives for ``field_file`` and describe them."""
+    storage = field_file.storage
+    with storage.open(field_file.name, 'rb') as source:
+        data = source.read()
+    digest = hashlib.sha256(data).hexdigest()
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    sources = {}
+    for extension, pil_format, mime_type, options in FORMATS:
+        items = []
+        for width in _target_widths(image.width):
+            name = _derived_name(digest, width, extension)
+            if not storage.exists(name):
+                storage.save(name, ContentFile(_encode(image, width, pil_format, options)))
+            items.append(Derivative(storage.url(name), width))
+        sources[mime_type] = items
+    return ResponsiveImage(sources, image.width, image.height)
+
+
+def responsive_image(field_file):
+    """Cached derivatives for ``field_file``, generating them on first use.
+
+    Returns None when the file is missing or can't be decoded, so callers can
+    fall back to the original upload.
+    """
+    if not field_file:
+        return None
+    storage = field_file.storage
+    try:
+        stamp = f'{storage.size(field_file.name)}:{storage.get_modified_time(field_file.name).timestamp()}'
+    except (OSError, NotImplementedError):
+        return None
+    key = 'portfolio:image:' + hashlib.md5(f'{field_file.name}:{stamp}:{get_widths()}'.encode('utf-8')).hexdigest()
+    cache = get_cache()
+    result = cache.get(key)
+    if result is None:
+        try:
+            result = generate_derivatives(field_file)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            logger.warning('Could not create derivatives for %s', field_file.name, exc_info=True)
+            return None
+        cache.set(key, result, None)
+    return result
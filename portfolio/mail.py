@@ -0,0 +1,122 @@
+"""Outbox for contact form email.
+
+``views.contact`` only stores the message; ``drain_outbox`` (run by the
+``drain_outbox`` management command) sends due messages in batches over one
+reused backend connection and reschedules failures with exponential backoff.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, f'PORTFOLIO_OUTBOX_{name}', default)
+
+
+def enqueue_contact_message(name, email, message):
+    return OutboxMessage.objects.create(
+        subject=f'Contact form submission from {name}',
+        body=f'From: {name} <{email}>\n\n{message}',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=settings.DEFAULT_FROM_EMAIL,
+        reply_to=email,
+    )
+
+
+def retry_delay(attempts):
+    """Backoff before attempt number ``attempts + 1``: doubles each time, capped."""
+    delay = _setting('RETRY_DELAY', 30) * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, _setting('MAX_RETRY_DELAY', 60 * 60)))
+
+
+def _email(outbox_message, connection):
+    return EmailMessage(
+        subject=outbox_message.subject,
+        body=outbox_message.body,
+        from_email=outbox_message.from_email,
+        to=[address.strip() for address in outbox_message.to.split(',') if address.strip()],
+        reply_to=[outbox_message.reply_to] if outbox_message.reply_to else None,
+        connection=connection,
+    )
+
+
+def _reschedule(outbox_message, exc, max_attempts):
+    """Record a failed attempt and back off, giving up after ``max_attempts``."""
+    outbox_message.attempts += 1
+    outbox_message.last_error = f'{type(exc).__name__}: {exc}'
+    if outbox_message.attempts >= max_attempts:
+        outbox_message.status = OutboxMessage.FAILED
+    else:
+        outbox_message.next_attempt_at = timezone.now() + retry_delay(outbox_message.attempts)
+    outbox_message.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def _defer(outbox_message, exc):
+    """Back off a message that wasn't tried because the server was unreachable."""
+    outbox_message.last_error = f'{type(exc).__name__}: {exc}'
+    outbox_message.next_attempt_at = timezone.now() + retry_delay(outbox_message.attempts + 1)
+    outbox_message.save(update_fields=['last_error', 'next_attempt_at'])
+
+
+def drain_outbox(batch_size=None, connection=None):
+    """Send one batch of due messages. Returns ``(sent, failed)`` counts.
+
+    When the mail server can't be reached, the unsent rest of the batch is
+    backed off without using up an attempt, since the messages themselves
+    are not at fault.
+    """
+    batch_size = batch_size or _setting('BATCH_SIZE', 50)
+    max_attempts = _setting('MAX_ATTEMPTS', 5)
+    batch = list(
+        OutboxMessage.objects
+        .filter(status=OutboxMessage.PENDING, next_attempt_at__lte=timezone.now())
+        .order_by('next_attempt_at', 'pk')[:batch_size]
+    )
+    if not batch:
+        return 0, 0
+
+    connection = connection or get_connection(fail_silently=False)
+    sent = failed = 0
+    try:
+        try:
+            connection.open()
+        except Exception as exc:
+            logger.warning('Opening the mail connection failed', exc_info=True)
+            for outbox_message in batch:
+                _defer(outbox_message, exc)
+            return 0, len(batch)
+
+        for index, outbox_message in enumerate(batch):
+            try:
+                _email(outbox_message, connection).send()
+            except Exception as exc:
+                logger.warning('Sending outbox message %s failed', outbox_message.pk, exc_info=True)
+                _reschedule(outbox_message, exc, max_attempts)
+                failed += 1
+                # The connection may be dead after an error; start a fresh one.
+                connection.close()
+                try:
+                    connection.open()
+                except Exception as exc:
+                    logger.warning('Reopening the mail connection failed', exc_info=True)
+                    for unsent in batch[index + 1:]:
+                        _defer(unsent, exc)
+                        failed += 1
+                    break
+            else:
+                outbox_message.status = OutboxMessage.SENT
+                outbox_message.sent_at = timezone.now()
+                outbox_message.attempts += 1
+                outbox_message.last_error = ''
+                outbox_message.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+
+from portfolio.benchmark import WORDS, generate_dataset, git_revision, run_async, run_threaded
+from portfolio.models import Project
+
+MODES = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent-request throughput of the sync views behind the WSGI handler '
+        'and the async views behind the ASGI handler, against a synthetic dataset'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=(*MODES, 'both'), default='both',
+                            help='Handler to measure; "both" runs each in its own process')
+        parser.add_argument('--concurrency', default='1,8,32',
+                            help='Comma-separated numbers of requests in flight (default 1,8,32)')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per concurrency level')
+        parser.add_argument('--projects', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Serve from the page cache (default stores nothing, so every request renders)')
+        parser.add_argument('--output', default=None, help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError('--concurrency takes comma-separated integers, e.g. 1,8,32')
+
+        if options['mode'] == 'both':
+            results = {mode: self.run_child(mode, options) for mode in MODES}
+        else:
+            results = {options['mode']: self.run_mode(options['mode'], levels, options)}
+
+        self.report(results)
+        if options['output']:
+            output = Path(options['output'])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps({
+                'git': git_revision(),
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'results': results,
+            }, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'✓ Results written to {output}'))
+
+    def run_child(self, mode, options):
+        """Run one mode in a fresh process, since the URLconf picks its views at import."""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / f'{mode}.json'
+            command = [
+                sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'benchmark_concurrency',
+                '--mode', mode, '--concurrency', options['concurrency'], '--requests', str(options['requests']),
+                '--projects', str(options['projects']), '--seed', str(options['seed']), '--output', str(output),
+            ]
+            if options['warm_cache']:
+                command.append('--warm-cache')
+            env = {**os.environ, 'PORTFOLIO_ASYNC_VIEWS': '1' if mode == 'asgi' else '0'}
+            self.stdout.write(f'Running the {mode.upper()} benchmark...')
+            completed = subprocess.run(command, env=env, capture_output=True, text=True)
+            if completed.returncode:
+                raise CommandError(f'{mode} benchmark failed:\n{completed.stderr}')
+            return json.loads(output.read_text())['results'][mode]
+
+    def run_mode(self, mode, levels, options):
+        if settings.PORTFOLIO_ASYNC_VIEWS != (mode == 'asgi'):
+            raise CommandError(f'Set PORTFOLIO_ASYNC_VIEWS={int(mode == "asgi")} to benchmark {mode}')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            generate_dataset(projects=options['projects'], seed=options['seed'])
+            urls = self.request_urls(options['projects'])
+            timeout = settings.PORTFOLIO_PAGE_CACHE_TIMEOUT if options['warm_cache'] else 0
+            with override_settings(PORTFOLIO_PAGE_CACHE_TIMEOUT=timeout):
+                return [self.run_level(mode, urls, level, options['requests']) for level in levels]
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def request_urls(self, projects):
+        """A mix of the public pages, requested round-robin."""
+        index = reverse('portfolio:index')
+        slugs = list(Project.objects.order_by('pk').values_list('slug', flat=True)[:max(projects, 1)])
+        urls = [index, f'{index}?category=Web', reverse('portfolio:contact')]
+        urls += [f'{index}?q={word}' for word in WORDS[:4]]
+        urls += [reverse('portfolio:project_detail', args=[slug]) for slug in slugs[::max(len(slugs) // 4, 1)][:4]]
+        return urls
+
+    def run_level(self, mode, urls, concurrency, requests):
+        if mode == 'wsgi':
+            # A thread per worker, as a threaded WSGI server would run it
+            local = threading.local()
+
+            def send(i):
+                if not hasattr(local, 'client'):
+                    local.client = Client()
+                return local.client.get(urls[i % len(urls)])
+            return run_threaded(send, requests, concurrency)
+
+        client = AsyncClient()
+        return run_async(lambda i: client.get(urls[i % len(urls)]), requests, concurrency)
+
+    def report(self, results):
+        self.stdout.write(f'{"mode":<6}{"in flight":>10}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"status":>12}')
+        for mode, rows in results.items():
+            for row in rows:
+                self.stdout.write(
+                    f'{mode:<6}{row["concurrency"]:>10}{row["requests_per_second"]:>10.1f}'
+                    f'{row["p50_ms"]:>10.2f}{row["p95_ms"]:>10.2f}{",".join(map(str, row["status"])):>12}'
+                )
+        if set(results) == set(MODES):
+            for wsgi, asgi in zip(results['wsgi'], results['asgi']):
+                ratio = asgi['requests_per_second'] / wsgi['requests_per_second']
+                self.stdout.write(f'ASGI/WSGI throughput at {wsgi["concurrency"]} in flight: {ratio:.2f}x')
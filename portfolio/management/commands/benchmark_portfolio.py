@@ -0,0 +1,125 @@
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import reverse
+
+from portfolio.benchmark import (
+    CATEGORIES, WORDS, compare, default_output_path, generate_dataset, git_revision, time_request,
+)
+from portfolio.cache import get_cache
+from portfolio.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Time the public views against a synthetic dataset in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--people', type=int, default=5)
+        parser.add_argument('--projects', type=int, default=500)
+        parser.add_argument('--testimonials', type=int, default=50)
+        parser.add_argument('--skills', type=int, default=30)
+        parser.add_argument('--technologies', type=int, default=40)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per scenario')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Keep the page cache between requests (default clears it before each one)')
+        parser.add_argument('--output', default=None,
+                            help='Results file (default benchmarks/<commit>.json)')
+        parser.add_argument('--compare', default=None, help='Earlier results file to compare against')
+        parser.add_argument('--max-regression', type=float, default=None,
+                            help='Fail if any p50 or query count grows by more than this many percent')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.stdout.write('Generating synthetic data...')
+            dataset = generate_dataset(
+                people=options['people'], projects=options['projects'],
+                testimonials=options['testimonials'], skills=options['skills'],
+                technologies=options['technologies'], seed=options['seed'],
+            )
+            scenarios = self.run_scenarios(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        revision = git_revision()
+        results = {
+            'git': revision,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'dataset': dataset,
+            'warm_cache': options['warm_cache'],
+            'scenarios': scenarios,
+        }
+
+        output = Path(options['output']) if options['output'] else default_output_path(revision)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2) + '\n')
+        self.stdout.write(self.style.SUCCESS(f'✓ Results written to {output}'))
+
+        if options['compare']:
+            self.report_comparison(results, options['compare'], options['max_regression'])
+
+    def run_scenarios(self, options):
+        client = Client()
+        cache = get_cache()
+        before_each = None if options['warm_cache'] else cache.clear
+        index = reverse('portfolio:index')
+        slug = Project.objects.order_by('pk').values_list('slug', flat=True)[options['projects'] // 2]
+        requests = {
+            'index': lambda i: client.get(index),
+            'index_search': lambda i: client.get(index, {'q': WORDS[i % len(WORDS)]}),
+            'index_category': lambda i: client.get(index, {'category': CATEGORIES[i % len(CATEGORIES)]}),
+            'index_search_category': lambda i: client.get(
+                index, {'q': WORDS[i % len(WORDS)], 'category': CATEGORIES[i % len(CATEGORIES)]}
+            ),
+            'project_detail': lambda i: client.get(reverse('portfolio:project_detail', args=[slug])),
+            'contact': lambda i: client.get(reverse('portfolio:contact')),
+            # A distinct sender per request keeps the rate limiter out of the measurement
+            'contact_post': lambda i: client.post(
+                reverse('portfolio:contact'),
+                {'name': f'Bench {i}', 'email': f'bench{i}@example.com', 'message': f'Benchmark message {i}'},
+                REMOTE_ADDR=f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}',
+            ),
+        }
+
+        scenarios = {}
+        self.stdout.write(f'{"scenario":<24}{"queries":>8}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+        for name, send in requests.items():
+            result = time_request(send, options['iterations'], options['warmup'], before_each)
+            scenarios[name] = result
+            self.stdout.write(
+                f'{name:<24}{result["queries"]:>8}{result["p50_ms"]:>10.2f}'
+                f'{result["p95_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+            )
+        return scenarios
+
+    def report_comparison(self, results, baseline_path, max_regression):
+        try:
+            baseline = json.loads(Path(baseline_path).read_text())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read {baseline_path}: {exc}')
+
+        commit = (baseline.get('git', {}).get('commit') or 'unknown')[:12]
+        self.stdout.write(f'\nCompared with {baseline_path} ({commit}):')
+        regressions = []
+        for name, metric, before, after, change in compare(results, baseline):
+            line = f'  {name:<24}{metric:<9}{before:>10}{after:>10}{change:>+9.1f}%'
+            if max_regression is not None and metric != 'p95_ms' and change > max_regression:
+                regressions.append(f'{name} {metric}')
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(f'Regressed by more than {max_regression}%: {", ".join(regressions)}')
@@ -0,0 +1,34 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from portfolio.mail import drain_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Send queued contact form email from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages sent per connection')
+        parser.add_argument('--loop', action='store_true', help='Keep running, polling for new messages')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls when idle (with --loop)')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = drain_outbox(options['batch_size'])
+            except Exception:
+                if not options['loop']:
+                    raise
+                # A worker outlives a dropped database connection or a bad
+                # message; log it and poll again after the interval.
+                logger.exception('Draining the outbox failed')
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(f'✓ Sent {sent}, failed {failed}')
+            if not options['loop']:
+                break
+            if not (sent or failed):
+                time.sleep(options['interval'])
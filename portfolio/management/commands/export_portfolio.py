@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from portfolio.bulk import MODELS, export_records, write_csv, write_jsonl
+
+
+class Command(BaseCommand):
+    help = 'Stream portfolio content to JSON Lines or CSV (see portfolio/bulk.py for the format)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help='File to write (default stdout)')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+        parser.add_argument('--model', choices=MODELS, action='append',
+                            help='Only export this model (repeatable; CSV takes exactly one)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows read from the database at a time')
+
+    def handle(self, *args, **options):
+        models = options['model'] or MODELS
+        if options['format'] == 'csv' and len(models) != 1:
+            raise CommandError('CSV export needs exactly one --model')
+
+        records = export_records(models, options['chunk_size'])
+        stream = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8', newline='')
+        try:
+            if options['format'] == 'csv':
+                count = write_csv(records, stream, models[0])
+            else:
+                count = write_jsonl(records, stream)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        self.stderr.write(self.style.SUCCESS(f'✓ Exported {count} records'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from portfolio.export import StaticExporter
+
+
+class Command(BaseCommand):
+    help = 'Export the portfolio to static HTML for GitHub Pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='docs', help='Output folder (default: docs)')
+        parser.add_argument('--workers', type=int, default=None, help='Number of render threads')
+        parser.add_argument('--force', action='store_true', help='Ignore the previous export manifest and rewrite everything')
+        parser.add_argument('--no-minify', action='store_true', help='Write pages and assets without minifying them')
+        parser.add_argument('--no-a11y', action='store_true', help='Skip the accessibility checks on exported pages')
+
+    def handle(self, *args, **options):
+        exporter = StaticExporter(
+            options['output'], workers=options['workers'], force=options['force'], minify=not options['no_minify'],
+            a11y=not options['no_a11y'],
+        )
+        report = exporter.export()
+
+        self.stdout.write('Pages:')
+        for result in sorted(report.pages, key=lambda result: result.page.path):
+            status = 'written' if result.written else 'unchanged'
+            self.stdout.write(f'  - {result.page.path:<50} {result.seconds * 1000:8.1f} ms  {status}')
+        for rel in report.removed:
+            self.stdout.write(self.style.WARNING(f'  ⊘ Removed: {rel}'))
+
+        slowest = sorted(report.pages, key=lambda result: result.seconds, reverse=True)[:3]
+        if slowest:
+            self.stdout.write('Slowest pages: ' + ', '.join(
+                f'{result.page.path} ({result.seconds * 1000:.1f} ms)' for result in slowest
+            ))
+        if not options['no_a11y']:
+            issues = sum(len(findings) for findings in report.a11y.values())
+            self.stdout.write(
+                f'Accessibility: {issues} issue(s) on {len(report.a11y)} page(s), '
+                f'{report.a11y_scanned} page(s) scanned, the rest unchanged since the last export'
+            )
+            for path, findings in report.a11y.items():
+                self.stdout.write(self.style.WARNING(f'  -- {path}'))
+                for finding in findings:
+                    self.stdout.write(self.style.WARNING(f'     - line {finding.line}: {finding.message}'))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ Static site exported to '{options['output']}/' in {report.seconds:.2f}s: "
+                f'{report.pages_written}/{len(report.pages)} pages written, '
+                f'{report.assets_copied} assets copied, {report.assets_unchanged} unchanged'
+            )
+        )
@@ -0,0 +1,50 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from portfolio.bulk import MODELS, BulkImportError, Importer, finish_import, read_csv, read_jsonl
+
+
+class Command(BaseCommand):
+    help = 'Bulk load portfolio content from JSON Lines or CSV (see portfolio/bulk.py for the format)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='File to read, or - for stdin')
+        parser.add_argument('--format', choices=['jsonl', 'csv'], default=None,
+                            help='Defaults to the file extension, or jsonl')
+        parser.add_argument('--model', choices=MODELS,
+                            help='Model of every row (required for CSV, optional for JSON Lines)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows per transaction')
+
+    def handle(self, *args, **options):
+        path = options['input']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        if file_format == 'csv' and not options['model']:
+            raise CommandError('CSV import needs --model')
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        start = time.perf_counter()
+        importer = Importer(options['chunk_size'])
+        try:
+            if file_format == 'csv':
+                records = read_csv(stream, options['model'])
+            else:
+                records = read_jsonl(stream, options['model'])
+            counts = importer.run(records)
+        except Exception as exc:
+            # The chunks before the failing one are committed, so the search
+            # index, counts and cached pages must catch up with them too.
+            if any(importer.counts.values()):
+                finish_import()
+            if isinstance(exc, (BulkImportError, KeyError, ValueError)):
+                raise CommandError(f'Import stopped: {exc!r}. Chunks before the failing one were kept.')
+            raise
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        finish_import()
+        summary = ', '.join(f'{count} {model}' for model, count in counts.items() if count)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Imported {summary or "nothing"} in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from portfolio.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project search index from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=None, help='Database alias to rebuild the index for')
+
+    def handle(self, *args, **options):
+        backend = get_backend(options['database'])
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Rebuilt search index ({type(backend).__name__})')
+        )
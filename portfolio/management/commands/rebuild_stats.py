@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from portfolio.cache import bump_content_version, bump_object_generation
+from portfolio.models import Person, Project
+from portfolio.stats import analyze_tables, rebuild_categories, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount the category counts and site-wide stats from the content tables, '
+        'and refresh the database\'s table statistics'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias to recount')
+
+    def handle(self, *args, **options):
+        rebuild_categories(options['database'])
+        stats = rebuild_stats(options['database'])
+        analyze_tables(options['database'])
+        bump_object_generation(Person, Project)
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Rebuilt stats: {stats.project_count} projects, {stats.person_count} people, '
+            f'{stats.technology_count} technologies, {stats.testimonial_count} testimonials'
+        ))
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+FTS_TABLE = 'portfolio_project_fts'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        if 'ENABLE_FTS5' not in {row[0] for row in cursor.fetchall()}:
+            return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "title, description, category, technologies, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {FTS_TABLE} (rowid, title, description, category, technologies) "
+        "SELECT p.id, p.title, p.description, p.category, "
+        "COALESCE((SELECT group_concat(t.name, ' ') FROM portfolio_project_technologies pt "
+        "JOIN portfolio_technology t ON t.id = pt.technology_id WHERE pt.project_id = p.id), '') "
+        "FROM portfolio_project p"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
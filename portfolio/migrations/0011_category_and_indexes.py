@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_categories(apps, schema_editor):
+    Category = apps.get_model('portfolio', 'Category')
+    Project = apps.get_model('portfolio', 'Project')
+    db_alias = schema_editor.connection.alias
+    counts = (
+        Project.objects.using(db_alias).exclude(category='')
+        .order_by().values_list('category').annotate(total=Count('pk'))
+    )
+    Category.objects.using(db_alias).bulk_create(
+        [Category(name=name, project_count=total) for name, total in counts]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_project_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('project_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Categories',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['-graduation_year'], name='portfolio_edu_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['-start_date'], name='portfolio_exp_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['order'], name='portfolio_person_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['category'], name='portfolio_project_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='portfolio_project_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['-created_at'], name='portfolio_testimonial_new_idx'),
+        ),
+        migrations.RunPython(populate_categories, migrations.RunPython.noop),
+    ]
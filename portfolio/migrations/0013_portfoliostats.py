@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:49
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_stats(apps, schema_editor):
+    PortfolioStats = apps.get_model('portfolio', 'PortfolioStats')
+    Project = apps.get_model('portfolio', 'Project')
+    Person = apps.get_model('portfolio', 'Person')
+    Technology = apps.get_model('portfolio', 'Technology')
+    Testimonial = apps.get_model('portfolio', 'Testimonial')
+    db_alias = schema_editor.connection.alias
+    testimonials = Testimonial.objects.using(db_alias).aggregate(total=Count('pk'), ratings=Sum('rating'))
+    PortfolioStats.objects.using(db_alias).create(
+        pk=1,
+        project_count=Project.objects.using(db_alias).count(),
+        person_count=Person.objects.using(db_alias).count(),
+        technology_count=Technology.objects.using(db_alias).count(),
+        testimonial_count=testimonials['total'],
+        rating_sum=testimonials['ratings'] or 0,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0012_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_count', models.PositiveIntegerField(default=0)),
+                ('person_count', models.PositiveIntegerField(default=0)),
+                ('technology_count', models.PositiveIntegerField(default=0)),
+                ('testimonial_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Portfolio stats',
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
 
 class Skill(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -12,6 +14,7 @@ class Skill(models.Model):
 class Technology(models.Model):
     name = models.CharField(max_length=100, unique=True)
     icon = models.CharField(max_length=50, blank=True, help_text='Font Awesome icon class or emoji')
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = 'Technologies'
@@ -36,10 +39,12 @@ class Person(models.Model):
     skills = models.ManyToManyField(Skill, blank=True, help_text='Select skills for this person')
     order = models.IntegerField(default=0, help_text='Display order (lower numbers first)')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name_plural = 'People'
         ordering = ['order']
+        indexes = [models.Index(fields=['order'], name='portfolio_person_order_idx')]
     
     def __str__(self):
         return self.name
@@ -57,9 +62,11 @@ class Experience(models.Model):
     start_date = models.DateField()
     end_date = models.DateField(null=True, blank=True, help_text='Leave blank if currently working here')
     is_current = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [models.Index(fields=['-start_date'], name='portfolio_exp_start_idx')]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
@@ -71,10 +78,12 @@ class Education(models.Model):
     program = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     graduation_year = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-graduation_year']
         verbose_name_plural = 'Education'
+        indexes = [models.Index(fields=['-graduation_year'], name='portfolio_edu_year_idx')]
 
     def __str__(self):
         return f"{self.program} from {self.school}"
@@ -86,9 +95,11 @@ class Testimonial(models.Model):
     quote = models.TextField()
     rating = models.IntegerField(default=5, choices=[(i, f'{i} stars') for i in range(1, 6)])
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['-created_at'], name='portfolio_testimonial_new_idx')]
 
     def __str__(self):
         return f"Testimonial from {self.client_name}"
@@ -103,9 +114,15 @@ class Project(models.Model):
     category = models.CharField(max_length=100, blank=True, help_text='e.g., Web, Mobile, Design')
     technologies = models.ManyToManyField(Technology, blank=True, help_text='Select technologies used')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['category'], name='portfolio_project_cat_idx'),
+            # Matches the keyset pagination order in portfolio/pagination.py
+            models.Index(fields=['-created_at', '-id'], name='portfolio_project_new_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -115,3 +132,66 @@ class Project(models.Model):
     def __str__(self):
         return self.title
 
+
+
+class Category(models.Model):
+    """Distinct Project.category values with their project counts, kept up to date by signals"""
+    name = models.CharField(max_length=100, unique=True)
+    project_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'Categories'
+
+    def __str__(self):
+        return self.name
+
+
+class PortfolioStats(models.Model):
+    """Site-wide totals for the index counters, a single row kept up to date by signals"""
+    SINGLETON_PK = 1
+
+    project_count = models.PositiveIntegerField(default=0)
+    person_count = models.PositiveIntegerField(default=0)
+    technology_count = models.PositiveIntegerField(default=0)
+    testimonial_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'Portfolio stats'
+
+    def __str__(self):
+        return 'Portfolio stats'
+
+    @property
+    def average_rating(self):
+        if not self.testimonial_count:
+            return None
+        return round(self.rating_sum / self.testimonial_count, 2)
+
+
+class OutboxMessage(models.Model):
+    """Email waiting to be sent by the outbox worker (manage.py drain_outbox)"""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (SENT, 'Sent'), (FAILED, 'Failed')]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.TextField(help_text='Comma-separated recipient addresses')
+    reply_to = models.CharField(max_length=254, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='portfolio_outbox_due_idx')]
+
+    def __str__(self):
+        return self.subject
@@ -0,0 +1,122 @@
+"""Cursor pagination for the project list.
+
+Plain listings page by keyset on ``(created_at, id)``, so deep pages cost the
+same as the first one. Search results are already a ranked list of ids, so
+their cursor is simply a position in that list.
+"""
+import base64
+import binascii
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+KEYSET_ORDERING = ('-created_at', '-id')
+# Most search result ids looked up in one query, well under SQLite's bound-parameter limit
+RANKED_BATCH_MAX = 500
+
+
+@dataclass
+class ProjectPage:
+    items: list
+    next_cursor: str = ''
+
+
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decoded cursor string, or '' for a missing or malformed cursor."""
+    if not cursor:
+        return ''
+    try:
+        return base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return ''
+
+
+def get_page_size():
+    return getattr(settings, 'PORTFOLIO_PROJECTS_PER_PAGE', 12)
+
+
+def _keyset_queryset(queryset, cursor, per_page):
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    created_at, _, pk = decode_cursor(cursor).rpartition('|')
+    try:
+        created_at = parse_datetime(created_at) if created_at else None
+    except ValueError:
+        # Well formed but impossible, e.g. month 13: treated as no cursor
+        created_at = None
+    if created_at and pk.isdigit():
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=int(pk))
+        )
+    return queryset[:per_page + 1]
+
+
+def _keyset_page(items, per_page):
+    page = ProjectPage(items=items[:per_page])
+    if len(items) > per_page:
+        last = page.items[-1]
+        page.next_cursor = encode_cursor(f'{last.created_at.isoformat()}|{last.pk}')
+    return page
+
+
+def paginate_keyset(queryset, cursor, per_page=None):
+    per_page = per_page or get_page_size()
+    items = list(_keyset_queryset(queryset, cursor, per_page))
+    return _keyset_page(items, per_page)
+
+
+def _ranked_offset(cursor):
+    offset = decode_cursor(cursor)
+    return int(offset) if offset.isdigit() else 0
+
+
+def _batch_sizes(per_page):
+    """Sizes of successive slices of the ranked ids, doubling up to RANKED_BATCH_MAX."""
+    size = per_page + 1
+    while True:
+        yield size
+        size = min(size * 2, RANKED_BATCH_MAX)
+
+
+def _collect_ranked(found, start, batch, objects, per_page):
+    """Append ``(position, object)`` for the batch's ids that passed the filters.
+
+    Returns True once one more than a page has been found.
+    """
+    for position, pk in enumerate(batch, start):
+        if pk in objects:
+            found.append((position, objects[pk]))
+            if len(found) > per_page:
+                return True
+    return False
+
+
+def _ranked_page(found, per_page):
+    page = ProjectPage(items=[obj for _, obj in found[:per_page]])
+    if len(found) > per_page:
+        # The cursor is the position of the next match in the ranked list
+        page.next_cursor = encode_cursor(str(found[per_page][0]))
+    return page
+
+
+def paginate_ranked(queryset, fetch_ranked, cursor, per_page=None):
+    """Page through ``queryset`` in the order of a ranked list of ids.
+
+    ``fetch_ranked(offset, limit)`` returns a slice of that list, so only a
+    page's worth of ids is read and looked up at a time and the cost follows
+    the page rather than the number of matches. Further slices are read only
+    when the queryset's filters leave too few of them.
+    """
+    per_page = per_page or get_page_size()
+    found, start = [], _ranked_offset(cursor)
+    for size in _batch_sizes(per_page):
+        batch = fetch_ranked(start, size)
+        if _collect_ranked(found, start, batch, queryset.in_bulk(batch), per_page) or len(batch) < size:
+            break
+        start += size
+    return _ranked_page(found, per_page)
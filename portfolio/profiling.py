@@ -0,0 +1,210 @@
+"""Opt-in request profiling.
+
+With ``PORTFOLIO_PROFILING = True`` the ``ProfilingMiddleware`` records, for
+every request, the number of SQL queries and the time spent in them, the time
+spent rendering each template and ``{% block %}``, and the total latency of
+the view. Results go into a bounded in-memory ring buffer that
+``report()`` summarises per view as p50/p95/p99, and each response carries
+the numbers in a ``Server-Timing`` header for the browser's dev tools.
+
+Template and block times are inclusive: a template's time contains the
+templates it extends or includes and the blocks it renders.
+"""
+import math
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template import base as template_base
+from django.template import loader_tags
+
+_current = ContextVar('portfolio_profile', default=None)
+_lock = threading.Lock()
+_records = None
+_patched = False
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.templates = {}
+        self.blocks = {}
+        self.render_time = 0.0
+        self._depth = 0
+
+    def add(self, bucket, name, elapsed):
+        bucket[name] = bucket.get(name, 0.0) + elapsed
+
+
+def _buffer():
+    global _records
+    if _records is None:
+        _records = deque(maxlen=getattr(settings, 'PORTFOLIO_PROFILING_BUFFER_SIZE', 1000))
+    return _records
+
+
+def _timed_template_render(original):
+    def _render(self, context):
+        profile = _current.get()
+        if profile is None:
+            return original(self, context)
+        profile._depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            profile._depth -= 1
+            profile.add(profile.templates, self.origin.template_name or self.name or '<string>', elapsed)
+            if profile._depth == 0:
+                profile.render_time += elapsed
+    return _render
+
+
+def _timed_block_render(original):
+    def render(self, context):
+        profile = _current.get()
+        if profile is None:
+            return original(self, context)
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            profile.add(profile.blocks, self.name, time.perf_counter() - start)
+    return render
+
+
+def install_template_timers():
+    """Wrap Template._render and BlockNode.render once per process."""
+    global _patched
+    if _patched:
+        return
+    template_base.Template._render = _timed_template_render(template_base.Template._render)
+    loader_tags.BlockNode.render = _timed_block_render(loader_tags.BlockNode.render)
+    _patched = True
+
+
+def _sql_timer(profile):
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            profile.queries += 1
+            profile.sql_time += time.perf_counter() - start
+    return wrapper
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+class ProfilingMiddleware:
+    """Put first in MIDDLEWARE so the total includes the rest of the stack."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PORTFOLIO_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_template_timers()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                timer = _sql_timer(profile)
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - start
+
+        match = request.resolver_match
+        record = {
+            'view': match.view_name if match else '<unresolved>',
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'time': time.time(),
+            'total_ms': _ms(total),
+            'sql_ms': _ms(profile.sql_time),
+            'queries': profile.queries,
+            'render_ms': _ms(profile.render_time),
+            'templates': {name: _ms(elapsed) for name, elapsed in profile.templates.items()},
+            'blocks': {name: _ms(elapsed) for name, elapsed in profile.blocks.items()},
+        }
+        with _lock:
+            _buffer().append(record)
+
+        response['Server-Timing'] = ', '.join([
+            f'sql;dur={record["sql_ms"]};desc="{profile.queries} queries"',
+            f'render;dur={record["render_ms"]}',
+            f'total;dur={record["total_ms"]}',
+        ])
+        return response
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def _summary(values):
+    values = sorted(values)
+    return {
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': values[-1] if values else None,
+    }
+
+
+def report():
+    """Per-view aggregates over the records currently in the ring buffer."""
+    with _lock:
+        records = list(_buffer())
+
+    by_view = {}
+    for record in records:
+        by_view.setdefault(record['view'], []).append(record)
+
+    views = {}
+    for view, rows in sorted(by_view.items()):
+        templates, blocks = {}, {}
+        for row in rows:
+            for name, elapsed in row['templates'].items():
+                templates.setdefault(name, []).append(elapsed)
+            for name, elapsed in row['blocks'].items():
+                blocks.setdefault(name, []).append(elapsed)
+        views[view] = {
+            'requests': len(rows),
+            'total_ms': _summary([row['total_ms'] for row in rows]),
+            'sql_ms': _summary([row['sql_ms'] for row in rows]),
+            'queries': _summary([row['queries'] for row in rows]),
+            'render_ms': _summary([row['render_ms'] for row in rows]),
+            'templates': {name: _summary(times) for name, times in sorted(templates.items())},
+            'blocks': {name: _summary(times) for name, times in sorted(blocks.items())},
+        }
+    return {
+        'records': len(records),
+        'capacity': _buffer().maxlen,
+        'views': views,
+        'recent': records[-20:],
+    }
+
+
+def reset():
+    with _lock:
+        _buffer().clear()
@@ -0,0 +1,33 @@
+"""Shared querysets for the public portfolio pages.
+
+Every relation the templates walk inside a loop is prefetched here so a page
+costs a fixed number of queries no matter how many rows are on it.
+"""
+from django.db.models import Prefetch
+
+from .models import Project, Skill, Person, Experience, Education, Testimonial, Technology
+
+
+def people_queryset():
+    return Person.objects.prefetch_related(
+        Prefetch('skills', queryset=Skill.objects.all()),
+        Prefetch('education', queryset=Education.objects.all()),
+    )
+
+
+def projects_queryset():
+    return Project.objects.prefetch_related(
+        Prefetch('technologies', queryset=Technology.objects.all()),
+    )
+
+
+def portfolio_snapshot():
+    """Querysets for everything rendered on the index page."""
+    return {
+        'projects': projects_queryset(),
+        'people': people_queryset(),
+        'skills': Skill.objects.all(),
+        'experiences': Experience.objects.all(),
+        'education': Education.objects.all(),
+        'testimonials': Testimonial.objects.all(),
+    }
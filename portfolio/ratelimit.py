@@ -0,0 +1,133 @@
+"""Cheap rejection of contact form floods.
+
+Each POST to the contact view first goes through a content-hash duplicate
+check and then through fixed-window counters kept in the cache: one per
+client IP and one per submitted email address. A request is turned away
+before the form is validated or anything is written to the outbox.
+
+The counters only use ``cache.add`` and ``cache.incr``, which are atomic in
+the cache backends, so concurrent requests can't all read the same count and
+slip through together.
+"""
+import hashlib
+import math
+import re
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import redirect
+
+from .cache import get_cache
+
+# (messages allowed, window length in seconds)
+DEFAULT_LIMITS = {
+    'ip': (5, 10 * 60),
+    'email': (3, 60 * 60),
+}
+
+
+def _limits():
+    return getattr(settings, 'PORTFOLIO_CONTACT_RATE_LIMITS', DEFAULT_LIMITS)
+
+
+def _dedup_window():
+    return getattr(settings, 'PORTFOLIO_CONTACT_DEDUP_WINDOW', 60 * 60)
+
+
+def _digest(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def client_ip(request):
+    if getattr(settings, 'PORTFOLIO_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def count_hit(scope, identity, limit, period):
+    """Count one request in the current window. Returns 0 when allowed,
+    otherwise the number of seconds until the window ends."""
+    cache = get_cache()
+    now = time.time()
+    window = int(now // period)
+    key = f'portfolio:ratelimit:{scope}:{_digest(identity)}:{window}'
+    cache.add(key, 0, period)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.add(key, 1, period)
+        count = 1
+    if count > limit:
+        return max(1, math.ceil((window + 1) * period - now))
+    return 0
+
+
+def _normalize(value):
+    return re.sub(r'\s+', ' ', value).strip().casefold()
+
+
+def message_key(name, email, message):
+    digest = _digest('\0'.join(_normalize(part) for part in (name, email, message)))
+    return f'portfolio:contact-seen:{digest}'
+
+
+def is_duplicate(name, email, message):
+    return get_cache().get(message_key(name, email, message)) is not None
+
+
+def remember_message(name, email, message):
+    """Record an accepted message so resubmissions within the window are dropped."""
+    get_cache().set(message_key(name, email, message), 1, _dedup_window())
+
+
+def _rejection(request):
+    """Response that turns the POST away, or None to let the view handle it."""
+    name = request.POST.get('name', '')
+    email = request.POST.get('email', '')
+    message = request.POST.get('message', '')
+    if is_duplicate(name, email, message):
+        # Already queued: behave as if it was accepted again
+        return redirect('portfolio:contact_thanks')
+
+    limits = _limits()
+    identities = {'ip': client_ip(request), 'email': _normalize(email)}
+    for scope, identity in identities.items():
+        if not identity or scope not in limits:
+            continue
+        retry_after = count_hit(scope, identity, *limits[scope])
+        if retry_after:
+            response = HttpResponse(
+                'Too many messages, please try again later.',
+                status=429, content_type='text/plain; charset=utf-8',
+            )
+            response['Retry-After'] = str(retry_after)
+            return response
+    return None
+
+
+def limit_contact_posts(view_func):
+    """Drop duplicate POSTs and answer over-limit ones with 429 before the view runs."""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped(request, *args, **kwargs):
+            if request.method == 'POST':
+                rejection = await sync_to_async(_rejection)(request)
+                if rejection is not None:
+                    return rejection
+            return await view_func(request, *args, **kwargs)
+        return _async_wrapped
+
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        if request.method == 'POST':
+            rejection = _rejection(request)
+            if rejection is not None:
+                return rejection
+        return view_func(request, *args, **kwargs)
+    return _wrapped
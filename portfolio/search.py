@@ -0,0 +1,263 @@
+"""Project search.
+
+On SQLite the projects are mirrored into an FTS5 virtual table (created by
+migration 0010) that is kept in sync by ``portfolio.signals``. Other databases
+fall back to an in-process inverted index that is rebuilt once per content
+version. Both backends rank results and treat every query word as a prefix,
+and return one slice of the ranking at a time; the FTS backend has SQLite
+apply the LIMIT/OFFSET.
+
+``client_index`` builds the same kind of inverted index as a JSON document,
+which ``static/js/main.js`` searches in the browser.
+"""
+import bisect
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.urls import reverse
+from django.utils.text import Truncator
+
+from .cache import get_content_version
+from .models import Project
+from .pagination import KEYSET_ORDERING
+from .queries import projects_queryset
+
+FTS_TABLE = 'portfolio_project_fts'
+FTS_COLUMNS = ('title', 'description', 'category', 'technologies')
+# Relative weight of a hit in each column, in FTS_COLUMNS order
+COLUMN_WEIGHTS = (10.0, 1.0, 3.0, 4.0)
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercase, accent-stripped word tokens, matching FTS5's unicode61 tokenizer."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return TOKEN_RE.findall(text.lower())
+
+
+def project_document(project):
+    """Column values indexed for ``project``, in FTS_COLUMNS order."""
+    return (
+        project.title,
+        project.description,
+        project.category,
+        ' '.join(tech.name for tech in project.technologies.all()),
+    )
+
+
+def match_expression(tokens):
+    """FTS5 query matching every token as a prefix."""
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+class SQLiteFTSBackend:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def search(self, query, offset=0, limit=None):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = match_expression(tokens)
+        weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s OFFSET %s',
+                [match, -1 if limit is None else limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def count(self, query, category=''):
+        tokens = tokenize(query)
+        if not tokens:
+            return 0
+        sql, params = f'SELECT COUNT(*) FROM {FTS_TABLE}', [match_expression(tokens)]
+        if category:
+            project_table = self.connection.ops.quote_name(Project._meta.db_table)
+            sql += f' JOIN {project_table} p ON p.id = {FTS_TABLE}.rowid AND p.category = %s'
+            params.insert(0, category)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'{sql} WHERE {FTS_TABLE} MATCH %s', params)
+            return cursor.fetchone()[0]
+
+    def _insert(self, cursor, rows):
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+    def index_projects(self, projects):
+        rows = [(project.pk, *project_document(project)) for project in projects]
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            self._insert(cursor, rows)
+
+    def remove_projects(self, pks):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in pks])
+
+    def rebuild(self):
+        """Refill the whole table with one INSERT ... SELECT inside the database."""
+        quote = self.connection.ops.quote_name
+        project = Project._meta
+        through = Project.technologies.through._meta
+        technology = Project.technologies.field.related_model._meta
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(FTS_COLUMNS)}) '
+                f'SELECT p.id, p.title, p.description, p.category, '
+                f"COALESCE(GROUP_CONCAT(t.name, ' '), '') "
+                f'FROM {quote(project.db_table)} p '
+                f'LEFT JOIN {quote(through.db_table)} pt ON pt.project_id = p.id '
+                f'LEFT JOIN {quote(technology.db_table)} t ON t.id = pt.technology_id '
+                f'GROUP BY p.id'
+            )
+
+
+class PythonIndexBackend:
+    """Inverted index held in process memory for databases without FTS5."""
+
+    _lock = threading.Lock()
+    _index = (None, None, None)
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def _build(self):
+        postings = defaultdict(dict)
+        queryset = Project.objects.using(self.connection.alias).prefetch_related('technologies')
+        for project in queryset.iterator(chunk_size=2000):
+            for weight, text in zip(COLUMN_WEIGHTS, project_document(project)):
+                for token in tokenize(text):
+                    scores = postings[token]
+                    scores[project.pk] = scores.get(project.pk, 0.0) + weight
+        return sorted(postings), dict(postings)
+
+    def _get_index(self):
+        version = get_content_version()
+        with self._lock:
+            if self._index[0] != version:
+                type(self)._index = (version, *self._build())
+            return self._index[1:]
+
+    def search(self, query, offset=0, limit=None):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        vocabulary, postings = self._get_index()
+        scores = None
+        for token in tokens:
+            token_scores = defaultdict(float)
+            start = bisect.bisect_left(vocabulary, token)
+            for term in vocabulary[start:]:
+                if not term.startswith(token):
+                    break
+                for pk, score in postings[term].items():
+                    token_scores[pk] += score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {pk: score + token_scores[pk] for pk, score in scores.items() if pk in token_scores}
+        ranked = sorted(scores, key=lambda pk: (-scores[pk], -pk))
+        return ranked[offset:None if limit is None else offset + limit]
+
+    def count(self, query, category=''):
+        pks = self.search(query)
+        if not category:
+            return len(pks)
+        return Project.objects.using(self.connection.alias).filter(pk__in=pks, category=category).count()
+
+    def index_projects(self, projects):
+        pass
+
+    def remove_projects(self, pks):
+        pass
+
+    def rebuild(self):
+        with self._lock:
+            type(self)._index = (None, None, None)
+
+
+def client_index():
+    """Every project and a weighted inverted index over them, for in-browser search.
+
+    ``projects`` are in listing order and carry what a result card shows.
+    ``terms`` is sorted so prefixes can be found by binary search, and
+    ``postings[i]`` is a flat ``[position, score, ...]`` list for ``terms[i]``,
+    scored like PythonIndexBackend.
+    """
+    projects = []
+    postings = defaultdict(dict)
+    queryset = projects_queryset().order_by(*KEYSET_ORDERING)
+    for position, project in enumerate(queryset.iterator(chunk_size=2000)):
+        projects.append({
+            'id': project.pk,
+            'title': project.title,
+            'url': reverse('portfolio:project_detail', args=[project.slug]),
+            'category': project.category,
+            'technologies': [tech.name for tech in project.technologies.all()],
+            'summary': Truncator(project.description).words(30),
+            'link': project.link,
+        })
+        for weight, text in zip(COLUMN_WEIGHTS, project_document(project)):
+            for token in tokenize(text):
+                scores = postings[token]
+                scores[position] = scores.get(position, 0) + weight
+    terms = sorted(postings)
+    return {
+        'projects': projects,
+        'terms': terms,
+        'postings': [
+            [value for item in sorted(postings[term].items()) for value in item] for term in terms
+        ],
+    }
+
+
+def max_search_results():
+    return getattr(settings, 'PORTFOLIO_SEARCH_MAX_RESULTS', 1000)
+
+
+def _has_fts_table(connection):
+    # Only a positive answer is remembered (per connection), so a check made
+    # before migrate created the table is not kept.
+    if not getattr(connection, 'portfolio_fts_table', False):
+        with connection.cursor() as cursor:
+            connection.portfolio_fts_table = FTS_TABLE in connection.introspection.table_names(cursor)
+    return connection.portfolio_fts_table
+
+
+def get_backend(using=None):
+    connection = connections[using or router.db_for_read(Project)]
+    if connection.vendor == 'sqlite' and _has_fts_table(connection):
+        return SQLiteFTSBackend(connection)
+    return PythonIndexBackend(connection)
+
+
+def search_project_ids(query, offset=0, limit=None):
+    """Primary keys of projects matching ``query``, best match first.
+
+    ``offset`` and ``limit`` select a slice of the ranking. Matches past
+    PORTFOLIO_SEARCH_MAX_RESULTS are never returned, which bounds how far a
+    filtered search can read.
+    """
+    end = max_search_results()
+    if limit is not None:
+        end = min(end, offset + limit)
+    if end <= offset:
+        return []
+    return get_backend().search(query, offset, end - offset)
+
+
+def count_project_matches(query, category=''):
+    """Number of projects matching ``query``, within ``category`` if given."""
+    return get_backend().count(query, category)
@@ -0,0 +1,273 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.utils import timezone
+
+from .cache import bump_content_version, bump_object_versions, mark_deleted
+from .images import responsive_image
+from .models import Project, Skill, Person, Experience, Education, Testimonial, Technology
+from .search import get_backend
+from .stats import adjust_category, adjust_stats, rebuild_stats
+
+CONTENT_MODELS = (Person, Project, Skill, Technology, Experience, Education, Testimonial)
+
+
+def content_changed(sender, **kwargs):
+    # Wait for the commit so a concurrent request can't cache the old rows
+    # under the new version.
+    transaction.on_commit(bump_content_version)
+
+
+def content_deleted(sender, **kwargs):
+    transaction.on_commit(partial(mark_deleted, sender))
+    content_changed(sender, **kwargs)
+
+
+def content_m2m_changed(sender, instance, action, reverse, model, pk_set, using, **kwargs):
+    if not action.startswith('post_'):
+        return
+    # Touch the owning rows so their updated_at reflects the new links.
+    if not reverse:
+        type(instance).objects.using(using).filter(pk=instance.pk).update(updated_at=timezone.now())
+    elif pk_set:
+        model.objects.using(using).filter(pk__in=pk_set).update(updated_at=timezone.now())
+    else:
+        # A reverse clear() doesn't say which owners lost a link.
+        transaction.on_commit(partial(mark_deleted, model))
+    content_changed(sender, **kwargs)
+
+
+for model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'portfolio_version_save_{model.__name__}')
+    post_delete.connect(content_deleted, sender=model, dispatch_uid=f'portfolio_version_delete_{model.__name__}')
+
+for through in (Project.technologies.through, Person.skills.through):
+    m2m_changed.connect(content_m2m_changed, sender=through, dispatch_uid=f'portfolio_version_m2m_{through.__name__}')
+
+
+# Search index
+
+def _reindex_projects(pks, using):
+    projects = Project.objects.using(using).filter(pk__in=pks).prefetch_related('technologies')
+    get_backend(using).index_projects(projects)
+
+
+def project_saved(sender, instance, using, **kwargs):
+    _reindex_projects([instance.pk], using)
+
+
+def project_deleted(sender, instance, using, **kwargs):
+    get_backend(using).remove_projects([instance.pk])
+
+
+def collect_technology_projects(sender, instance, using, **kwargs):
+    instance._search_project_ids = list(instance.project_set.using(using).values_list('pk', flat=True))
+
+
+def project_technologies_changed(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if action == 'pre_clear' and reverse:
+        collect_technology_projects(sender, instance, using)
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        pks = [instance.pk]
+    elif pk_set:
+        pks = pk_set
+    else:
+        # A reverse clear() doesn't pass pk_set; use the ids collected in pre_clear.
+        pks = getattr(instance, '_search_project_ids', ())
+    _reindex_projects(pks, using)
+
+
+def technology_saved(sender, instance, created, using, **kwargs):
+    # A renamed technology changes the indexed text of every project using it.
+    if not created:
+        collect_technology_projects(sender, instance, using)
+        _reindex_projects(instance._search_project_ids, using)
+
+
+def technology_deleted(sender, instance, using, **kwargs):
+    _reindex_projects(getattr(instance, '_search_project_ids', ()), using)
+
+
+post_save.connect(project_saved, sender=Project, dispatch_uid='portfolio_search_save_project')
+post_delete.connect(project_deleted, sender=Project, dispatch_uid='portfolio_search_delete_project')
+m2m_changed.connect(project_technologies_changed, sender=Project.technologies.through, dispatch_uid='portfolio_search_m2m')
+pre_delete.connect(collect_technology_projects, sender=Technology, dispatch_uid='portfolio_search_pre_delete_technology')
+post_save.connect(technology_saved, sender=Technology, dispatch_uid='portfolio_search_save_technology')
+post_delete.connect(technology_deleted, sender=Technology, dispatch_uid='portfolio_search_delete_technology')
+
+
+# Fragment versions of the person and project cards
+
+# M2M through table -> (card model, field); M2M target model -> (card model, field)
+CARD_LINKS = {Project.technologies.through: (Project, 'technologies'), Person.skills.through: (Person, 'skills')}
+CARD_TARGETS = {Technology: (Project, 'technologies'), Skill: (Person, 'skills')}
+
+
+def _bump_cards(model, pks):
+    pks = [pk for pk in pks if pk is not None]
+    if pks:
+        transaction.on_commit(partial(bump_object_versions, model, pks))
+
+
+def _card_owner_ids(owner, field, target_pk, using):
+    return list(owner.objects.using(using).filter(**{field: target_pk}).values_list('pk', flat=True))
+
+
+def card_changed(sender, instance, **kwargs):
+    _bump_cards(sender, [instance.pk])
+
+
+def remember_education_person(sender, instance, raw, using, **kwargs):
+    if instance.pk is None or raw:
+        instance._previous_person_id = None
+    else:
+        instance._previous_person_id = (
+            Education.objects.using(using).filter(pk=instance.pk).values_list('person_id', flat=True).first()
+        )
+
+
+def education_changed(sender, instance, **kwargs):
+    # Both the new and, after a move, the previous person's card list it
+    _bump_cards(Person, {instance.person_id, getattr(instance, '_previous_person_id', None)})
+
+
+def card_links_changed(sender, instance, action, reverse, pk_set, using, **kwargs):
+    owner, field = CARD_LINKS[sender]
+    if action == 'pre_clear' and reverse:
+        instance._card_owner_ids = _card_owner_ids(owner, field, instance.pk, using)
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        pks = [instance.pk]
+    elif pk_set:
+        pks = pk_set
+    else:
+        pks = getattr(instance, '_card_owner_ids', ())
+    _bump_cards(owner, pks)
+
+
+def collect_card_owners(sender, instance, using, **kwargs):
+    owner, field = CARD_TARGETS[sender]
+    instance._card_owner_ids = _card_owner_ids(owner, field, instance.pk, using)
+
+
+def card_target_saved(sender, instance, created, using, **kwargs):
+    # A renamed skill or technology shows up on every card that lists it
+    if not created:
+        owner, field = CARD_TARGETS[sender]
+        _bump_cards(owner, _card_owner_ids(owner, field, instance.pk, using))
+
+
+def card_target_deleted(sender, instance, **kwargs):
+    owner, _ = CARD_TARGETS[sender]
+    _bump_cards(owner, getattr(instance, '_card_owner_ids', ()))
+
+
+for model in (Person, Project):
+    post_save.connect(card_changed, sender=model, dispatch_uid=f'portfolio_card_save_{model.__name__}')
+    post_delete.connect(card_changed, sender=model, dispatch_uid=f'portfolio_card_delete_{model.__name__}')
+pre_save.connect(remember_education_person, sender=Education, dispatch_uid='portfolio_card_pre_save_education')
+post_save.connect(education_changed, sender=Education, dispatch_uid='portfolio_card_save_education')
+post_delete.connect(education_changed, sender=Education, dispatch_uid='portfolio_card_delete_education')
+for through in CARD_LINKS:
+    m2m_changed.connect(card_links_changed, sender=through, dispatch_uid=f'portfolio_card_m2m_{through.__name__}')
+for model in CARD_TARGETS:
+    pre_delete.connect(collect_card_owners, sender=model, dispatch_uid=f'portfolio_card_pre_delete_{model.__name__}')
+    post_save.connect(card_target_saved, sender=model, dispatch_uid=f'portfolio_card_save_{model.__name__}')
+    post_delete.connect(card_target_deleted, sender=model, dispatch_uid=f'portfolio_card_delete_{model.__name__}')
+
+
+# Category counts
+
+def remember_project_category(sender, instance, raw, using, **kwargs):
+    if instance.pk is None or raw:
+        instance._previous_category = None
+    else:
+        instance._previous_category = (
+            Project.objects.using(using).filter(pk=instance.pk).values_list('category', flat=True).first()
+        )
+
+
+def project_category_saved(sender, instance, created, using, **kwargs):
+    previous = getattr(instance, '_previous_category', None)
+    if previous == instance.category and not created:
+        return
+    adjust_category(previous, -1, using)
+    adjust_category(instance.category, 1, using)
+
+
+def project_category_deleted(sender, instance, using, **kwargs):
+    adjust_category(instance.category, -1, using)
+
+
+pre_save.connect(remember_project_category, sender=Project, dispatch_uid='portfolio_category_pre_save')
+post_save.connect(project_category_saved, sender=Project, dispatch_uid='portfolio_category_save')
+post_delete.connect(project_category_deleted, sender=Project, dispatch_uid='portfolio_category_delete')
+
+
+# Site-wide totals
+
+STAT_COUNTERS = {
+    Project: 'project_count',
+    Person: 'person_count',
+    Technology: 'technology_count',
+}
+
+
+def stats_row_saved(sender, instance, created, using, **kwargs):
+    if created:
+        adjust_stats(using, **{STAT_COUNTERS[sender]: 1})
+
+
+def stats_row_deleted(sender, instance, using, **kwargs):
+    adjust_stats(using, **{STAT_COUNTERS[sender]: -1})
+
+
+def remember_testimonial_rating(sender, instance, raw, using, **kwargs):
+    if instance.pk is None or raw:
+        instance._previous_rating = None
+    else:
+        instance._previous_rating = (
+            Testimonial.objects.using(using).filter(pk=instance.pk).values_list('rating', flat=True).first()
+        )
+
+
+def testimonial_stats_saved(sender, instance, created, using, **kwargs):
+    if created:
+        adjust_stats(using, testimonial_count=1, rating_sum=instance.rating)
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is None:
+        # Raw fixture load or an update of a row we couldn't read beforehand
+        rebuild_stats(using)
+    else:
+        adjust_stats(using, rating_sum=instance.rating - previous)
+
+
+def testimonial_stats_deleted(sender, instance, using, **kwargs):
+    adjust_stats(using, testimonial_count=-1, rating_sum=-instance.rating)
+
+
+for model in STAT_COUNTERS:
+    post_save.connect(stats_row_saved, sender=model, dispatch_uid=f'portfolio_stats_save_{model.__name__}')
+    post_delete.connect(stats_row_deleted, sender=model, dispatch_uid=f'portfolio_stats_delete_{model.__name__}')
+pre_save.connect(remember_testimonial_rating, sender=Testimonial, dispatch_uid='portfolio_stats_pre_save_testimonial')
+post_save.connect(testimonial_stats_saved, sender=Testimonial, dispatch_uid='portfolio_stats_save_testimonial')
+post_delete.connect(testimonial_stats_deleted, sender=Testimonial, dispatch_uid='portfolio_stats_delete_testimonial')
+
+
+# Responsive image derivatives
+
+def build_image_derivatives(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    field_file = instance.photo if sender is Person else instance.image
+    if field_file:
+        transaction.on_commit(partial(responsive_image, field_file))
+
+
+post_save.connect(build_image_derivatives, sender=Person, dispatch_uid='portfolio_images_person')
+post_save.connect(build_image_derivatives, sender=Project, dispatch_uid='portfolio_images_project')
@@ -0,0 +1,96 @@
+"""Denormalized counters kept in step with the content tables.
+
+Signals in ``portfolio.signals`` apply small increments as rows change, so the
+public pages read counts from a handful of rows instead of aggregating over
+whole tables: project counts per category live in ``Category`` and site-wide
+totals in the single ``PortfolioStats`` row. ``rebuild_categories`` and
+``rebuild_stats`` recompute them from scratch for migrations and bulk loads
+that bypass signals.
+
+``analyze_tables`` refreshes the database's own table statistics after such
+loads, which the admin reads as row estimates for tables without a counter.
+"""
+from django.db import connections
+from django.db.models import Count, F, Sum
+
+from .models import Category, PortfolioStats, Person, Project, Technology, Testimonial
+
+
+def adjust_category(name, delta, using='default'):
+    if not name:
+        return
+    category, _ = Category.objects.using(using).get_or_create(name=name)
+    Category.objects.using(using).filter(pk=category.pk).update(project_count=F('project_count') + delta)
+
+
+def rebuild_categories(using='default'):
+    counts = dict(
+        Project.objects.using(using).exclude(category='')
+        .order_by().values_list('category').annotate(total=Count('pk'))
+    )
+    Category.objects.using(using).exclude(name__in=counts).update(project_count=0)
+    existing = set(Category.objects.using(using).values_list('name', flat=True))
+    Category.objects.using(using).bulk_create(
+        [Category(name=name) for name in counts if name not in existing]
+    )
+    for name, total in counts.items():
+        Category.objects.using(using).filter(name=name).update(project_count=total)
+
+
+def category_choices():
+    """Category names that currently have at least one project."""
+    return Category.objects.filter(project_count__gt=0).values_list('name', flat=True)
+
+
+def category_project_count(name):
+    return Category.objects.filter(name=name).values_list('project_count', flat=True).first() or 0
+
+
+def compute_stats(using='default'):
+    """An unsaved PortfolioStats holding totals aggregated from the content tables."""
+    testimonials = Testimonial.objects.using(using).aggregate(total=Count('pk'), ratings=Sum('rating'))
+    return PortfolioStats(
+        pk=PortfolioStats.SINGLETON_PK,
+        project_count=Project.objects.using(using).count(),
+        person_count=Person.objects.using(using).count(),
+        technology_count=Technology.objects.using(using).count(),
+        testimonial_count=testimonials['total'],
+        rating_sum=testimonials['ratings'] or 0,
+    )
+
+
+def rebuild_stats(using='default'):
+    stats = compute_stats(using)
+    stats.save(using=using)
+    return stats
+
+
+def adjust_stats(using='default', **deltas):
+    """Add ``deltas`` (field name -> change) to the stats row."""
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+    updated = PortfolioStats.objects.using(using).filter(pk=PortfolioStats.SINGLETON_PK).update(**changes)
+    if not updated:
+        # No row yet: counting from scratch already includes this change
+        rebuild_stats(using)
+
+
+def portfolio_stats():
+    """The stats row, or totals aggregated on the spot if it is missing."""
+    return PortfolioStats.objects.filter(pk=PortfolioStats.SINGLETON_PK).first() or compute_stats()
+
+
+def analyze_tables(using='default'):
+    """Refresh the query planner's table statistics (and row estimates)."""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        # Fills sqlite_stat1; the limit samples large indexes instead of reading them whole
+        statements = ['PRAGMA analysis_limit = 1000', 'ANALYZE']
+    elif connection.vendor == 'postgresql':
+        statements = ['ANALYZE']
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
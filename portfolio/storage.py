@@ -0,0 +1,60 @@
+"""Static files storages that precompress text assets during collectstatic."""
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage
+from django.core.files.base import ContentFile
+from django.utils.functional import cached_property
+
+from .compress import precompressed_variants
+
+SIDECAR_SUFFIXES = ('.gz', '.br')
+
+
+class CompressedStaticFilesMixin:
+    def post_process(self, paths, dry_run=False, **options):
+        parent = getattr(super(), 'post_process', None)
+        if parent is not None:
+            yield from parent(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(self.listdir_recursive()):
+            if name.endswith(SIDECAR_SUFFIXES) or name == getattr(self, 'manifest_name', None):
+                continue
+            if self.sidecars_current(name):
+                continue
+            with self.open(name) as source:
+                data = source.read()
+            for suffix, blob in precompressed_variants(name, data).items():
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self.save(name + suffix, ContentFile(blob))
+
+    def sidecars_current(self, name):
+        """Whether ``name`` has sidecars and none is older than it.
+
+        collectstatic leaves unchanged files alone, so their sidecars from the
+        previous run can be kept instead of being compressed again.
+        """
+        sidecars = [name + suffix for suffix in SIDECAR_SUFFIXES if self.exists(name + suffix)]
+        if not sidecars:
+            return False
+        modified = self.get_modified_time(name)
+        return all(self.get_modified_time(sidecar) >= modified for sidecar in sidecars)
+
+    def listdir_recursive(self, path=''):
+        directories, files = self.listdir(path)
+        for name in files:
+            yield f'{path}/{name}' if path else name
+        for directory in directories:
+            yield from self.listdir_recursive(f'{path}/{directory}' if path else directory)
+
+
+class CompressedStaticFilesStorage(CompressedStaticFilesMixin, StaticFilesStorage):
+    pass
+
+
+class CompressedManifestStaticFilesStorage(CompressedStaticFilesMixin, ManifestStaticFilesStorage):
+    """Content-hashed file names (via staticfiles.json) plus precompressed siblings."""
+
+    @cached_property
+    def immutable_names(self):
+        """Hashed names from the manifest; their content never changes, so they can be cached forever."""
+        return frozenset(self.hashed_files.values())
@@ -0,0 +1,27 @@
+from django import template
+from django.utils.html import format_html
+
+from portfolio.images import responsive_image as get_responsive_image
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(field_file, alt='', sizes='100vw', css_class=''):
+    """<picture> with WebP and JPEG srcsets for an uploaded image."""
+    if not field_file:
+        return ''
+    image = get_responsive_image(field_file)
+    if image is None:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async">',
+            field_file.url, alt, css_class,
+        )
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        image.srcset('image/webp'), sizes,
+        image.fallback.url, image.srcset('image/jpeg'), sizes, image.width, image.height, alt, css_class,
+    )
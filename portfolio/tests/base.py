@@ -0,0 +1,12 @@
+from django.test import TestCase, override_settings
+
+from portfolio.cache import get_cache
+
+
+# The read-only alias is a separate connection, which can't see the rows a
+# TestCase writes inside its transaction, so tests read through the default one.
+@override_settings(PORTFOLIO_READ_DATABASE=None)
+class PortfolioTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
@@ -0,0 +1,97 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from portfolio import a11y
+from portfolio.export import AccessibilityCheck, Page
+
+BROKEN_PAGE = b"""<!DOCTYPE html>
+<html>
+<body>
+  <h1>Portfolio</h1>
+  <h1>Again</h1>
+  <h3>Skipped a level</h3>
+  <img src="/media/team.jpg">
+  <img src="/static/divider.svg" alt="">
+  <label for="email">Email</label>
+  <input id="email" name="email">
+  <input id="message" name="message">
+  <input type="hidden" id="token" name="token">
+  <a href="/github/"><span class="icon"></span></a>
+  <a href="/twitter/" aria-label="Twitter"></a>
+</body>
+</html>
+"""
+
+CLEAN_PAGE = b"""<!DOCTYPE html>
+<html lang="en">
+<body>
+  <h1>Portfolio</h1>
+  <h2>Team</h2>
+  <img src="/media/team.jpg" alt="The team">
+  <a href="/contact/">Contact</a>
+</body>
+</html>
+"""
+
+
+class ScanTests(SimpleTestCase):
+    def test_reports_known_violations(self):
+        findings = a11y.scan_html(BROKEN_PAGE)
+        self.assertEqual([finding.rule for finding in findings], [
+            'html-lang', 'img-alt', 'img-empty-alt', 'input-label', 'multiple-h1', 'heading-order', 'link-name',
+        ])
+        by_rule = {finding.rule: finding for finding in findings}
+        self.assertIn('/media/team.jpg', by_rule['img-alt'].message)
+        self.assertIn('"message"', by_rule['input-label'].message)
+        self.assertEqual(by_rule['multiple-h1'].line, 5)
+        self.assertEqual(by_rule['link-name'].line, 13)
+
+    def test_clean_page(self):
+        self.assertEqual(a11y.scan_html(CLEAN_PAGE), [])
+
+    def test_fragment_skips_document_rules(self):
+        fragment = b'<h3>Card</h3><img src="/media/a.jpg">'
+        self.assertEqual([finding.rule for finding in a11y.scan_html(fragment, fragment=True)], ['img-alt'])
+
+    def test_scan_folder_and_reports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, 'broken.html').write_bytes(BROKEN_PAGE)
+            Path(tmp, 'clean.html').write_bytes(CLEAN_PAGE)
+            results = a11y.scan_folder(tmp, jobs=1)
+        self.assertEqual([Path(path).name for path in results], ['broken.html'])
+        self.assertEqual(len(json.loads(a11y.to_json(results))[next(iter(results))]), 7)
+        sarif = json.loads(a11y.to_sarif(results))
+        self.assertEqual(len(sarif['runs'][0]['results']), 7)
+        self.assertIn('Image without alt', a11y.to_text(results))
+
+
+class AccessibilityCheckTests(SimpleTestCase):
+    page = Page('/', 'index.html')
+
+    def test_findings_are_recorded_and_content_passes_through(self):
+        check = AccessibilityCheck()
+        self.assertEqual(check(self.page, BROKEN_PAGE), BROKEN_PAGE)
+        check(Page('/contact/', 'contact/index.html'), CLEAN_PAGE)
+        self.assertEqual(list(check.findings), ['index.html'])
+        self.assertEqual(len(check.findings['index.html']), 7)
+
+    def test_unchanged_page_is_not_rescanned(self):
+        first = AccessibilityCheck()
+        first(self.page, BROKEN_PAGE)
+        first(Page('/copy/', 'copy/index.html'), BROKEN_PAGE)
+        self.assertEqual(first.scanned, 1)
+
+        # The next export starts from the entries saved in the manifest
+        second = AccessibilityCheck()
+        second.load(json.loads(json.dumps(first.entries())))
+        with mock.patch('portfolio.export.scan_html', wraps=a11y.scan_html) as scan:
+            second(self.page, BROKEN_PAGE)
+            second(Page('/contact/', 'contact/index.html'), CLEAN_PAGE)
+        self.assertEqual(scan.call_count, 1)
+        self.assertEqual(second.scanned, 1)
+        self.assertEqual(second.findings['index.html'], first.findings['index.html'])
+        self.assertEqual(len(second.entries()), 2)
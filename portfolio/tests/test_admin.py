@@ -0,0 +1,64 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from portfolio.admin import estimated_row_count
+from portfolio.models import Education, Experience, Person, PortfolioStats, Project
+from portfolio.stats import analyze_tables
+
+from .base import PortfolioTestCase
+
+
+class AdminTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.person = Person.objects.create(name='Ada')
+        self.other = Person.objects.create(name='Grace')
+        Education.objects.bulk_create(Education(person=self.person, school=f'School {i}', graduation_year=2000 + i) for i in range(25))
+        Education.objects.create(person=self.other, school='Elsewhere', graduation_year=2010)
+        Experience.objects.create(person=self.person, title='Developer', company='Acme', start_date=date(2020, 1, 1))
+
+    def test_unfiltered_changelist_uses_the_maintained_total(self):
+        for i in range(3):
+            Project.objects.create(title=f'Project {i}', slug=f'project-{i}')
+        PortfolioStats.objects.update(project_count=1234)
+        url = reverse('admin:portfolio_project_changelist')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.context['cl'].result_count, 1234)
+        self.assertFalse([q for q in queries if 'COUNT(' in q['sql'] and 'portfolio_project"' in q['sql']])
+
+        filtered = self.client.get(url, {'q': 'Project'})
+        self.assertEqual(filtered.context['cl'].result_count, 3)
+
+    def test_analyze_fills_the_sqlite_estimate(self):
+        analyze_tables()
+        self.assertEqual(estimated_row_count(Education, 'default'), 26)
+
+    @override_settings(PORTFOLIO_ADMIN_ESTIMATE_COUNT_OVER=10)
+    def test_large_table_uses_the_estimate(self):
+        analyze_tables()
+        Education.objects.create(person=self.other, school='Not yet analyzed', graduation_year=2011)
+        response = self.client.get(reverse('admin:portfolio_education_changelist'))
+        self.assertEqual(response.context['cl'].result_count, 26)
+
+    def test_person_form_links_to_every_entry(self):
+        response = self.client.get(reverse('admin:portfolio_person_change', args=[self.person.pk]))
+        self.assertEqual(len(response.context['inline_admin_formsets'][0].formset.get_queryset()), 20)
+        education_url = f"{reverse('admin:portfolio_education_changelist')}?person__id__exact={self.person.pk}"
+        self.assertContains(response, f'<a href="{education_url}">25 education</a>', html=True)
+        self.assertContains(response, '1 experiences')
+
+        response = self.client.get(education_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 25)
+
+    def test_add_form_has_no_links(self):
+        response = self.client.get(reverse('admin:portfolio_person_add'))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,84 @@
+import gzip
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+
+from portfolio.models import Person, Project, Technology
+
+from .base import PortfolioTestCase
+
+
+class ApiTests(PortfolioTestCase):
+    url = reverse('portfolio:api_projects')
+
+    def setUp(self):
+        super().setUp()
+        django = Technology.objects.create(name='Django')
+        for i in range(3):
+            project = Project.objects.create(
+                title=f'Project {i}', slug=f'project-{i}', category='Web', description='A project. ' * 20,
+            )
+            project.technologies.add(django)
+
+    def get_json(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_all_fields(self):
+        payload = self.get_json()
+        self.assertEqual(payload['count'], 3)
+        first = payload['results'][0]
+        self.assertEqual(first['title'], 'Project 2')
+        self.assertEqual(first['technologies'], ['Django'])
+        self.assertEqual(first['url'], reverse('portfolio:project_detail', args=['project-2']))
+
+    def test_field_selection(self):
+        payload = self.get_json(fields='slug, id')
+        self.assertEqual(list(payload['results'][0]), ['id', 'slug'])
+
+    def test_unknown_field(self):
+        response = self.client.get(self.url, {'fields': 'slug,nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Available fields', json.loads(response.content)['error'])
+
+    def test_payload_is_cached_until_an_edit(self):
+        self.get_json()
+        with self.assertNumQueries(0):
+            self.get_json()
+        project = Project.objects.get(slug='project-2')
+        project.title = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertEqual(self.get_json()['results'][0]['title'], 'Renamed')
+
+    def test_compressed_variant(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 3)
+
+    def test_matching_etag_gets_304(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    @override_settings(PORTFOLIO_API_STREAM_OVER=2)
+    def test_long_list_is_streamed_then_cached(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        streamed = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(streamed)['count'], 3)
+
+        # The ETag names the identity body that was sent, not the gzip one
+        identity = self.client.get(self.url)
+        self.assertFalse(identity.streaming)
+        self.assertEqual(identity.content, streamed)
+        self.assertEqual(identity['ETag'], response['ETag'])
+        self.assertNotEqual(self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')['ETag'], response['ETag'])
+
+    def test_people(self):
+        Person.objects.create(name='Ada')
+        self.assertEqual(self.get_json(reverse('portfolio:api_people'), fields='name')['results'], [{'name': 'Ada'}])
@@ -0,0 +1,42 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from portfolio.assets import serve_static
+
+
+class ServeStaticTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        (root / 'css').mkdir()
+        (root / 'css' / 'styles.css').write_bytes(b'/* collected earlier */')
+        (root / 'css' / 'styles.0123456789ab.css').write_bytes(b'/* hashed */')
+        (root / 'staticfiles.json').write_text(json.dumps({
+            'version': '1.1', 'hash': 'test', 'paths': {'css/styles.css': 'css/styles.0123456789ab.css'},
+        }))
+        self.source = (Path(settings.BASE_DIR) / 'static' / 'css' / 'styles.css').read_bytes()
+
+    def get(self, path):
+        response = serve_static(RequestFactory().get(f'/static/{path}'), path)
+        return response, b''.join(response.streaming_content)
+
+    def test_debug_serves_the_source_over_a_stale_copy(self):
+        with override_settings(DEBUG=True, STATIC_ROOT=self.tmp.name):
+            self.assertEqual(self.get('css/styles.css')[1], self.source)
+
+    def test_production_serves_the_collected_copy(self):
+        with override_settings(DEBUG=False, STATIC_ROOT=self.tmp.name):
+            self.assertEqual(self.get('css/styles.css')[1], b'/* collected earlier */')
+
+    def test_hashed_name_is_immutable(self):
+        with override_settings(DEBUG=False, STATIC_ROOT=self.tmp.name):
+            response, content = self.get('css/styles.0123456789ab.css')
+            plain, _ = self.get('css/styles.css')
+        self.assertEqual(content, b'/* hashed */')
+        self.assertEqual(response['Cache-Control'], settings.PORTFOLIO_IMMUTABLE_CACHE_CONTROL)
+        self.assertFalse(plain.has_header('Cache-Control'))
@@ -0,0 +1,46 @@
+from asgiref.sync import sync_to_async
+from django.test import RequestFactory
+from django.urls import reverse
+
+from portfolio import async_views, views
+from portfolio.benchmark import generate_dataset
+from portfolio.cache import get_cache
+from portfolio.models import OutboxMessage
+
+from .base import PortfolioTestCase
+
+
+class AsyncViewTests(PortfolioTestCase):
+    """The async views render exactly what their sync counterparts do."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(people=3, projects=30, seed=0)
+
+    async def assertSameResponse(self, name, path, **kwargs):
+        expected = await sync_to_async(getattr(views, name))(RequestFactory().get(path), **kwargs)
+        # Render again rather than answer from the page cache
+        await get_cache().aclear()
+        response = await getattr(async_views, name)(RequestFactory().get(path), **kwargs)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+
+    async def test_pages_match(self):
+        index = reverse('portfolio:index')
+        await self.assertSameResponse('index', index)
+        await self.assertSameResponse('index', f'{index}?q=django')
+        await self.assertSameResponse('index', f'{index}?category=Web')
+        await self.assertSameResponse('project_fragment', reverse('portfolio:project_fragment'))
+        await self.assertSameResponse(
+            'project_detail', reverse('portfolio:project_detail', args=['synthetic-project-3']),
+            slug='synthetic-project-3',
+        )
+
+    async def test_contact_post_is_queued(self):
+        request = RequestFactory().post(
+            reverse('portfolio:contact'), {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'},
+        )
+        request._dont_enforce_csrf_checks = True
+        response = await async_views.contact(request)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(await OutboxMessage.objects.acount(), 1)
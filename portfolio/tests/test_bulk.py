@@ -0,0 +1,115 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+
+from portfolio.bulk import export_records, write_jsonl
+from portfolio.cache import get_content_version
+from portfolio.models import Category, Person, PortfolioStats, Project, Skill, Technology
+from portfolio.search import search_project_ids
+
+from .base import PortfolioTestCase
+
+RECORDS = [
+    {'model': 'technology', 'name': 'Django'},
+    {'model': 'person', 'name': 'Ada', 'bio': 'Engineer.', 'skills': ['Python', 'SQL'],
+     'education': [{'school': 'Uni', 'program': 'CS', 'graduation_year': 2015}],
+     'experiences': [{'title': 'Developer', 'company': 'Acme', 'start_date': '2016-01-01'}]},
+    {'model': 'project', 'title': 'Shop front', 'description': 'A store.', 'category': 'Web',
+     'technologies': ['Django', 'Postgres'], 'created_at': '2020-05-01T12:00:00+00:00'},
+    {'model': 'project', 'title': 'Space game', 'slug': 'space', 'category': 'Game', 'technologies': ['Unity']},
+]
+
+
+def _comparable(records):
+    """Records without created_at, in an order that doesn't depend on primary keys."""
+    rows = []
+    for record in records:
+        record = {key: sorted(value, key=json.dumps) if isinstance(value, list) else value
+                  for key, value in record.items() if key != 'created_at'}
+        rows.append(json.dumps(record, sort_keys=True))
+    return sorted(rows)
+
+
+class ImportPortfolioTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def import_records(self, records, *args):
+        path = Path(self.tmp.name) / 'import.jsonl'
+        path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+        call_command('import_portfolio', str(path), *args, stdout=io.StringIO())
+
+    def test_import(self):
+        self.import_records(RECORDS)
+        ada = Person.objects.get(name='Ada')
+        self.assertEqual(sorted(ada.skills.values_list('name', flat=True)), ['Python', 'SQL'])
+        self.assertEqual(ada.education.get().graduation_year, 2015)
+        self.assertEqual(ada.experiences.get().company, 'Acme')
+
+        shop = Project.objects.get(slug='shop-front')
+        self.assertEqual(sorted(shop.technologies.values_list('name', flat=True)), ['Django', 'Postgres'])
+        self.assertEqual(shop.created_at.year, 2020)
+        self.assertEqual(Technology.objects.count(), 3)
+
+    def test_import_refreshes_what_signals_would(self):
+        version = get_content_version()
+        self.import_records(RECORDS)
+        self.assertEqual(search_project_ids('postgres'), [Project.objects.get(slug='shop-front').pk])
+        self.assertEqual(dict(Category.objects.values_list('name', 'project_count')), {'Game': 1, 'Web': 1})
+        stats = PortfolioStats.objects.get()
+        self.assertEqual((stats.project_count, stats.person_count, stats.technology_count), (2, 1, 3))
+        self.assertGreater(get_content_version(), version)
+
+    def test_reimport_rerenders_cached_cards(self):
+        self.import_records(RECORDS)
+        self.assertContains(self.client.get('/'), 'Shop front')
+        changed = [dict(record) for record in RECORDS]
+        changed[1]['bio'] = 'Engineer and writer.'
+        changed[2].update(title='Shop window', slug='shop-front')
+        self.import_records(changed)
+        response = self.client.get('/')
+        self.assertContains(response, 'Shop window')
+        self.assertNotContains(response, 'Shop front')
+        self.assertContains(response, 'Engineer and writer.')
+
+    def test_reimport_updates_in_place(self):
+        self.import_records(RECORDS)
+        changed = [dict(record) for record in RECORDS]
+        changed[2]['description'] = 'A bigger store.'
+        changed[2]['technologies'] = ['Django']
+        self.import_records(changed)
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertEqual(Person.objects.count(), 1)
+        shop = Project.objects.get(slug='shop-front')
+        self.assertEqual(shop.description, 'A bigger store.')
+        self.assertEqual(list(shop.technologies.values_list('name', flat=True)), ['Django'])
+        self.assertEqual(Person.objects.get().education.count(), 1)
+
+    def test_failed_chunk_keeps_and_refreshes_earlier_ones(self):
+        records = [RECORDS[2], {'model': 'project', 'description': 'No title or slug'}]
+        with self.assertRaisesMessage(CommandError, 'Chunks before the failing one were kept'):
+            self.import_records(records, '--chunk-size', '1')
+        self.assertEqual(list(Project.objects.values_list('slug', flat=True)), ['shop-front'])
+        # finish_import ran for the committed chunk
+        self.assertEqual(search_project_ids('store'), [Project.objects.get().pk])
+        self.assertEqual(PortfolioStats.objects.get().project_count, 1)
+
+    def test_export_round_trip(self):
+        self.import_records(RECORDS)
+        out = io.StringIO()
+        write_jsonl(export_records(), out)
+        exported = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        Person.objects.all().delete()
+        Project.objects.all().delete()
+        Skill.objects.all().delete()
+        self.import_records(exported)
+        out_again = io.StringIO()
+        write_jsonl(export_records(), out_again)
+        reimported = [json.loads(line) for line in out_again.getvalue().splitlines()]
+        self.assertEqual(_comparable(reimported), _comparable(exported))
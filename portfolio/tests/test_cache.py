@@ -0,0 +1,99 @@
+from django.urls import reverse
+
+from portfolio.cache import get_content_version, get_object_versions
+from portfolio.models import Project, Technology
+
+from .base import PortfolioTestCase
+
+
+class ContentVersionTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(title='Original title', slug='original', description='A project.')
+        self.other = Project.objects.create(title='Other project', slug='other', description='Another one.')
+
+    def test_edit_invalidates_cached_page(self):
+        url = reverse('portfolio:index')
+        self.assertContains(self.client.get(url), 'Original title')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.title = 'Renamed project'
+            self.project.save()
+
+        response = self.client.get(url)
+        self.assertContains(response, 'Renamed project')
+        self.assertNotContains(response, 'Original title')
+
+    def test_version_is_bumped_only_after_commit(self):
+        version = get_content_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.project.save()
+            self.assertEqual(get_content_version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_content_version(), version)
+
+    def test_edit_bumps_only_the_edited_card(self):
+        before = get_object_versions(Project, [self.project.pk, self.other.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        after = get_object_versions(Project, [self.project.pk, self.other.pk])
+        self.assertNotEqual(after[self.project.pk], before[self.project.pk])
+        self.assertEqual(after[self.other.pk], before[self.other.pk])
+
+    def test_m2m_change_touches_owner_and_invalidates(self):
+        technology = Technology.objects.create(name='Django')
+        stamp = Project.objects.values_list('updated_at', flat=True).get(pk=self.project.pk)
+        version = get_content_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            technology.project_set.add(self.project)
+
+        self.assertGreater(Project.objects.values_list('updated_at', flat=True).get(pk=self.project.pk), stamp)
+        self.assertGreater(get_content_version(), version)
+
+
+class ConditionalRequestTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(title='A project', slug='a-project', description='A project.')
+        self.url = reverse('portfolio:project_detail', args=['a-project'])
+
+    def test_matching_etag_gets_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_unchanged_since_last_modified_gets_304(self):
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_not_found_has_no_validators(self):
+        response = self.client.get(reverse('portfolio:project_detail', args=['missing']))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_error_response_has_no_validators(self):
+        response = self.client.get(reverse('portfolio:api_projects'), {'fields': 'nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_etag_varies_with_encoding(self):
+        identity = self.client.get(self.url)['ETag']
+        gzip = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        self.assertNotEqual(identity, gzip)
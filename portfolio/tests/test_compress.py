@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from portfolio.compress import minify_html
+
+
+class MinifyHtmlTests(SimpleTestCase):
+    def test_collapses_whitespace_between_tags(self):
+        html = b'<ul>\n    <li>One   item</li>\n\n    <li>Two</li>\n</ul>\n'
+        self.assertEqual(minify_html(html), b'<ul>\n<li>One item</li>\n<li>Two</li>\n</ul>\n')
+
+    def test_attribute_values_are_kept(self):
+        html = (
+            b'<p>\n  <img alt="A  wide   view" data-caption=\'two  spaces > one\'\n'
+            b'       title="line\n   break">  caption\n</p>\n'
+        )
+        minified = minify_html(html)
+        self.assertIn(b'alt="A  wide   view"', minified)
+        self.assertIn(b"data-caption='two  spaces > one'", minified)
+        self.assertIn(b'title="line\n   break"', minified)
+        self.assertIn(b'> caption\n</p>', minified)
+
+    def test_raw_blocks_and_comments(self):
+        html = b'<!-- note --><pre>  keep\n    this</pre>  <script>\n  // comment\n  run();\n</script>'
+        self.assertEqual(minify_html(html), b'<pre>  keep\n    this</pre> <script>run();</script>\n')
@@ -0,0 +1,54 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.db import DatabaseError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+
+class PragmaTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'db.sqlite3'
+        sqlite3.connect(self.path).execute('CREATE TABLE item (id INTEGER PRIMARY KEY)').connection.close()
+
+    def connection(self, **options):
+        handler = ConnectionHandler({'default': {'ENGINE': 'portfolio.db', 'NAME': self.path, 'OPTIONS': options}})
+        connection = handler['default']
+        self.addCleanup(connection.close)
+        return connection
+
+    def pragma(self, connection, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def file_format(self):
+        # Header bytes 18-19 are 1 for the rollback journal and 2 for WAL
+        return self.path.read_bytes()[18:20]
+
+    def test_defaults_leave_the_file_alone(self):
+        connection = self.connection()
+        self.assertEqual(self.pragma(connection, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(connection, 'busy_timeout'), 5000)
+        self.assertEqual(self.file_format(), b'\x01\x01')
+
+    def test_wal_is_opt_in(self):
+        connection = self.connection(wal=True)
+        self.assertEqual(self.pragma(connection, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(connection, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.file_format(), b'\x02\x02')
+
+    def test_pragma_overrides(self):
+        connection = self.connection(pragmas={'cache_size': -1024, 'mmap_size': None})
+        self.assertEqual(self.pragma(connection, 'cache_size'), -1024)
+        self.assertEqual(self.pragma(connection, 'mmap_size'), 0)
+
+    def test_read_only_connection_rejects_writes(self):
+        connection = self.connection(read_only=True, wal=True)
+        self.assertEqual(self.pragma(connection, 'query_only'), 1)
+        with self.assertRaises(DatabaseError), connection.cursor() as cursor:
+            cursor.execute('INSERT INTO item DEFAULT VALUES')
+        self.assertEqual(self.file_format(), b'\x01\x01')
@@ -0,0 +1,78 @@
+import io
+import re
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import override_settings
+from PIL import Image
+
+from portfolio.models import Project
+
+from .base import PortfolioTestCase
+
+
+def png_upload(name='photo.png', size=(800, 400)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'teal').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(PORTFOLIO_IMAGE_WIDTHS=(320, 640, 960))
+class ResponsiveImageTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.media = Path(tmp.name)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def create_project(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Project.objects.create(title='Pictured', slug='pictured', image=image)
+
+    def derived(self, extension):
+        return sorted(self.media.glob(f'derived/*/*.{extension}'))
+
+    def render(self, project):
+        return Template(
+            '{% load portfolio_tags %}{% responsive_image project.image alt="Screenshot" sizes="50vw" %}'
+        ).render(Context({'project': project}))
+
+    def test_derivatives_are_generated_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Project.objects.create(title='Pictured', slug='pictured', image=png_upload())
+        self.assertEqual(self.derived('webp'), [])
+        for callback in callbacks:
+            callback()
+
+        for extension, pil_format in (('webp', 'WEBP'), ('jpg', 'JPEG')):
+            widths = []
+            for path in self.derived(extension):
+                with Image.open(path) as image:
+                    self.assertEqual(image.format, pil_format)
+                    widths.append(image.width)
+                    self.assertEqual(image.height, image.width // 2)
+            # Never upscaled: widths above the original are replaced by the original
+            self.assertEqual(sorted(widths), [320, 640, 800])
+
+    def test_tag_emits_srcsets(self):
+        project = self.create_project(png_upload())
+        html = self.render(project)
+        webp = re.search(r'<source type="image/webp" srcset="([^"]+)" sizes="50vw">', html).group(1)
+        self.assertRegex(webp, r'^/media/derived/\w\w/\w+-320\.webp 320w, \S+-640\.webp 640w, \S+-800\.webp 800w$')
+        self.assertRegex(html, r'<img src="/media/derived/\w\w/\w+-640\.jpg" srcset="[^"]+-320\.jpg 320w, ')
+        self.assertIn('width="800" height="400" alt="Screenshot"', html)
+
+    def test_tag_falls_back_to_the_upload(self):
+        with self.assertLogs('portfolio.images', 'WARNING'):
+            broken = self.create_project(SimpleUploadedFile('broken.png', b'not an image'))
+            html = self.render(broken)
+        self.assertEqual(html, f'<img src="{broken.image.url}" alt="Screenshot" class="" loading="lazy" decoding="async">')
+        self.assertEqual(self.derived('jpg'), [])
+
+        broken.image = ''
+        self.assertEqual(self.render(broken), '')
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from portfolio.mail import drain_outbox, enqueue_contact_message
+from portfolio.models import OutboxMessage
+
+from .base import PortfolioTestCase
+
+
+class UnreachableBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('SMTP is down')
+
+
+class FlakyBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise OSError('Connection reset')
+
+
+class DrainOutboxTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            enqueue_contact_message(f'Sender {i}', f'sender{i}@example.com', 'Hello')
+
+    def test_sends_due_messages(self):
+        self.assertEqual(drain_outbox(), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.SENT).exists())
+
+    def test_unreachable_server_backs_off_the_batch(self):
+        with self.assertLogs('portfolio.mail', 'WARNING'):
+            self.assertEqual(drain_outbox(connection=UnreachableBackend()), (0, 3))
+        for message in OutboxMessage.objects.all():
+            self.assertEqual(message.status, OutboxMessage.PENDING)
+            self.assertEqual(message.attempts, 0)
+            self.assertGreater(message.next_attempt_at, timezone.now())
+            self.assertIn('SMTP is down', message.last_error)
+        # Nothing is due until the backoff has passed
+        self.assertEqual(drain_outbox(connection=UnreachableBackend()), (0, 0))
+
+    def test_unreachable_server_never_gives_up(self):
+        OutboxMessage.objects.update(attempts=10)
+        with self.assertLogs('portfolio.mail', 'WARNING'):
+            drain_outbox(connection=UnreachableBackend())
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.PENDING).exists())
+
+    def test_send_failure_gives_up_after_max_attempts(self):
+        OutboxMessage.objects.update(attempts=4)
+        with self.assertLogs('portfolio.mail', 'WARNING'):
+            self.assertEqual(drain_outbox(connection=FlakyBackend()), (0, 3))
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.FAILED).exists())
+
+    def test_loop_survives_errors(self):
+        calls = []
+
+        def drain(batch_size):
+            calls.append(batch_size)
+            if len(calls) == 1:
+                raise RuntimeError('database is locked')
+            raise KeyboardInterrupt
+
+        with mock.patch('portfolio.management.commands.drain_outbox.drain_outbox', drain), \
+                mock.patch('portfolio.management.commands.drain_outbox.time.sleep') as sleep, \
+                self.assertLogs('portfolio.management.commands.drain_outbox', 'ERROR'):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command('drain_outbox', '--loop', '--interval', '0')
+        self.assertEqual(len(calls), 2)
+        sleep.assert_called_once_with(0.0)
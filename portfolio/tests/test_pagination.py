@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from portfolio.export import LinkRewriter, Page
+from portfolio.models import Project
+from portfolio.pagination import decode_cursor, encode_cursor, paginate_keyset
+
+from .base import PortfolioTestCase
+
+
+class KeysetPaginationTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.projects = [
+            Project.objects.create(title=f'Project {i}', slug=f'project-{i}', category='Web' if i % 2 else 'Game')
+            for i in range(25)
+        ]
+        # Groups of five share a timestamp, so ties are broken by id
+        start = timezone.now()
+        for i, project in enumerate(self.projects):
+            Project.objects.filter(pk=project.pk).update(created_at=start - timedelta(minutes=i // 5))
+        self.expected = list(Project.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def walk(self, queryset, per_page):
+        pages, cursor = [], ''
+        while True:
+            page = paginate_keyset(queryset, cursor, per_page=per_page)
+            pages.append([project.pk for project in page.items])
+            if not page.next_cursor:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once_across_ties(self):
+        pages = self.walk(Project.objects.all(), per_page=7)
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 4])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_filtered_pages(self):
+        games = Project.objects.filter(category='Game')
+        pages = self.walk(games, per_page=5)
+        self.assertEqual(sum(pages, []), [pk for pk in self.expected if games.filter(pk=pk).exists()])
+
+    def test_exact_last_page_has_no_cursor(self):
+        self.assertEqual(self.walk(Project.objects.all(), per_page=5)[-1], self.expected[20:])
+
+    def test_cursor_page_runs_one_query(self):
+        cursor = paginate_keyset(Project.objects.all(), '', per_page=10).next_cursor
+        with self.assertNumQueries(1):
+            page = paginate_keyset(Project.objects.all(), cursor, per_page=10)
+        self.assertEqual([project.pk for project in page.items], self.expected[10:20])
+
+    def test_malformed_cursor_starts_over(self):
+        for cursor in ('not base64!', encode_cursor('garbage'), encode_cursor('2020-01-01|x')):
+            page = paginate_keyset(Project.objects.all(), cursor, per_page=3)
+            self.assertEqual([project.pk for project in page.items], self.expected[:3])
+        self.assertEqual(decode_cursor('%%%'), '')
+
+    def test_impossible_date_in_cursor_starts_over(self):
+        cursor = encode_cursor(f'2024-13-45T00:00:00|{self.expected[0]}')
+        page = paginate_keyset(Project.objects.all(), cursor, per_page=3)
+        self.assertEqual([project.pk for project in page.items], self.expected[:3])
+        for name in ('portfolio:index', 'portfolio:project_fragment'):
+            response = self.client.get(reverse(name), {'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([project.pk for project in response.context['projects']], self.expected[:12])
+
+    def test_fragment_continues_the_index(self):
+        index = self.client.get(reverse('portfolio:index'))
+        shown = [project.pk for project in index.context['projects']]
+        fragment = self.client.get(f"{reverse('portfolio:project_fragment')}?{index.context['next_page_query']}")
+        shown += [project.pk for project in fragment.context['projects']]
+        self.assertEqual(shown, self.expected[:len(shown)])
+        self.assertEqual(len(set(shown)), len(shown))
+
+
+class ExportLoadMoreTests(PortfolioTestCase):
+    def test_query_only_link_is_dropped(self):
+        fragment_url = reverse('portfolio:project_fragment') + '?cursor=abc'
+        rewriter = LinkRewriter([Page('/', 'index.html'), Page(fragment_url, 'fragments/projects-2.html', 'index.html')])
+        content = rewriter(Page('/', 'index.html'), (
+            f'<a href="?cursor=abc#projects" class="load-more" data-fragment-url="{fragment_url}">More</a>'
+        ).encode())
+        self.assertEqual(
+            content, b'<a class="load-more" data-fragment-url="./fragments/projects-2.html">More</a>',
+        )
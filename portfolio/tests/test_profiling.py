@@ -0,0 +1,63 @@
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from portfolio import profiling
+from portfolio.models import Project
+
+from .base import PortfolioTestCase
+
+
+class ProfilingMiddlewareTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        profiling.reset()
+        self.addCleanup(profiling.reset)
+        Project.objects.create(title='A project', slug='a-project')
+        self.url = reverse('portfolio:project_detail', args=['a-project'])
+
+    @override_settings(PORTFOLIO_PROFILING=False)
+    def test_inert_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            profiling.ProfilingMiddleware(lambda request: None)
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(profiling.report()['records'], 0)
+
+    @override_settings(PORTFOLIO_PROFILING=True)
+    def test_records_queries_and_timings(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^sql;dur=[\d.]+;desc="\d+ queries", render;dur=[\d.]+, total;dur=[\d.]+$')
+        self.assertEqual(int(re.search(r'(\d+) queries', timing).group(1)), len(queries))
+
+        recent = profiling.report()['recent'][-1]
+        self.assertEqual(
+            (recent['view'], recent['status'], recent['queries']), ('portfolio:project_detail', 200, len(queries)),
+        )
+        self.assertIn('portfolio/project_detail.html', recent['templates'])
+        self.assertIn('content', recent['blocks'])
+        self.assertGreaterEqual(recent['total_ms'], recent['render_ms'])
+
+    @override_settings(PORTFOLIO_PROFILING=True)
+    def test_report_aggregates_per_view(self):
+        for _ in range(3):
+            self.client.get(self.url)
+        staff = get_user_model().objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        report = json.loads(self.client.get(reverse('portfolio:profiling_report')).content)
+        view = report['views']['portfolio:project_detail']
+        self.assertEqual(view['requests'], 3)
+        self.assertEqual(set(view['total_ms']), {'p50', 'p95', 'p99', 'max'})
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual([profiling.percentile(values, pct) for pct in (50, 95, 99, 100)], [50, 95, 99, 100])
+        self.assertIsNone(profiling.percentile([], 50))
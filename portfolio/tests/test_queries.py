@@ -0,0 +1,24 @@
+from django.urls import reverse
+
+from portfolio.benchmark import generate_dataset
+
+from .base import PortfolioTestCase
+
+
+class IndexQueryCountTests(PortfolioTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(people=100, projects=1000, seed=0)
+
+    def test_index_query_count_is_fixed(self):
+        # Seven Last-Modified aggregates, then the page itself
+        with self.assertNumQueries(18):
+            response = self.client.get(reverse('portfolio:index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['people']), 100)
+
+    def test_cached_index_runs_no_queries(self):
+        self.client.get(reverse('portfolio:index'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('portfolio:index'))
+        self.assertEqual(response.status_code, 200)
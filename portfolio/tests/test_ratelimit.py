@@ -0,0 +1,94 @@
+import threading
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from portfolio.models import OutboxMessage
+from portfolio.ratelimit import count_hit
+
+from .base import PortfolioTestCase
+
+
+class ContactRateLimitTests(PortfolioTestCase):
+    url = reverse('portfolio:contact')
+
+    def setUp(self):
+        super().setUp()
+        # Keep every request in one window
+        clock = mock.patch('portfolio.ratelimit.time')
+        clock.start().time.return_value = 1_000_000.0
+        self.addCleanup(clock.stop)
+
+    def post(self, email='visitor@example.com', message='Hello there', **extra):
+        return self.client.post(self.url, {'name': 'Visitor', 'email': email, 'message': message}, **extra)
+
+    def test_duplicate_is_accepted_but_not_queued_twice(self):
+        self.assertRedirects(self.post(), reverse('portfolio:contact_thanks'))
+        self.assertRedirects(self.post(message='  hello   THERE '), reverse('portfolio:contact_thanks'))
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_email_bucket(self):
+        for i in range(3):
+            self.assertEqual(self.post(message=f'Message {i}').status_code, 302)
+        response = self.post(message='One too many', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+
+    def test_ip_bucket(self):
+        for i in range(5):
+            self.assertEqual(self.post(email=f'visitor{i}@example.com').status_code, 302)
+        self.assertEqual(self.post(email='another@example.com').status_code, 429)
+        self.assertEqual(self.post(email='another@example.com', REMOTE_ADDR='10.0.0.2').status_code, 302)
+
+    def test_rejected_before_validation(self):
+        for i in range(5):
+            self.post(email=f'visitor{i}@example.com')
+        response = self.post(email='not an email')
+        self.assertEqual(response.status_code, 429)
+
+    def test_forwarded_for_is_ignored_unless_trusted(self):
+        for i in range(5):
+            self.post(email=f'visitor{i}@example.com', HTTP_X_FORWARDED_FOR=f'203.0.113.{i}')
+        self.assertEqual(self.post(email='another@example.com', HTTP_X_FORWARDED_FOR='203.0.113.9').status_code, 429)
+
+    @override_settings(PORTFOLIO_TRUST_X_FORWARDED_FOR=True)
+    def test_trusted_forwarded_for_is_the_client(self):
+        for i in range(6):
+            response = self.post(email=f'visitor{i}@example.com', HTTP_X_FORWARDED_FOR=f'203.0.113.{i}, 10.0.0.1')
+            self.assertEqual(response.status_code, 302)
+
+    def test_get_is_not_limited(self):
+        for i in range(5):
+            self.post(email=f'visitor{i}@example.com')
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+class WindowCounterTests(PortfolioTestCase):
+    def test_window_resets(self):
+        with mock.patch('portfolio.ratelimit.time') as clock:
+            clock.time.return_value = 1020.0
+            self.assertEqual([count_hit('test', 'key', 2, 60) for _ in range(2)], [0, 0])
+            self.assertEqual(count_hit('test', 'key', 2, 60), 60)
+            clock.time.return_value = 1079.5
+            self.assertEqual(count_hit('test', 'key', 2, 60), 1)
+            clock.time.return_value = 1080.0
+            self.assertEqual([count_hit('test', 'key', 2, 60) for _ in range(3)], [0, 0, 60])
+
+    def test_concurrent_requests_share_the_limit(self):
+        start = threading.Barrier(20)
+        results = []
+
+        def hit():
+            start.wait()
+            results.append(count_hit('test', 'burst', 5, 600))
+
+        threads = [threading.Thread(target=hit) for _ in range(20)]
+        with mock.patch('portfolio.ratelimit.time') as clock:
+            clock.time.return_value = 1020.0
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results.count(0), 5)
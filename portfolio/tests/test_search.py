@@ -0,0 +1,161 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from portfolio.models import Project, Technology
+from portfolio.pagination import paginate_ranked
+from portfolio.search import PythonIndexBackend, SQLiteFTSBackend, get_backend, search_project_ids
+
+from .base import PortfolioTestCase
+
+
+class SearchRankingTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.in_description = Project.objects.create(
+            title='Inventory tool', slug='inventory', description='Stock levels, built with Django.',
+        )
+        self.in_title = Project.objects.create(
+            title='Django dashboard', slug='dashboard', description='Charts for a shop.',
+        )
+        self.in_technologies = Project.objects.create(
+            title='Booking site', slug='booking', description='Reservations for a hotel.',
+        )
+        self.in_technologies.technologies.add(Technology.objects.create(name='Django'))
+        Project.objects.create(title='Shader toy', slug='shader', description='Nothing relevant.')
+
+    def test_title_outranks_technologies_outranks_description(self):
+        self.assertEqual(
+            search_project_ids('django'),
+            [self.in_title.pk, self.in_technologies.pk, self.in_description.pk],
+        )
+
+    def test_words_match_as_prefixes_and_all_must_match(self):
+        self.assertEqual(search_project_ids('dash djan'), [self.in_title.pk])
+        self.assertEqual(search_project_ids('djang hotel'), [self.in_technologies.pk])
+        self.assertEqual(search_project_ids('django shader'), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.in_title.title = 'Sales dashboard'
+        self.in_title.save()
+        self.assertNotIn(self.in_title.pk, search_project_ids('django'))
+        self.in_description.delete()
+        self.assertEqual(search_project_ids('django'), [self.in_technologies.pk])
+
+    def test_search_page_lists_best_match_first(self):
+        response = self.client.get(reverse('portfolio:index'), {'q': 'django'})
+        self.assertEqual(
+            [project.pk for project in response.context['projects']],
+            [self.in_title.pk, self.in_technologies.pk, self.in_description.pk],
+        )
+
+    def test_slices_of_the_ranking(self):
+        ranking = [self.in_title.pk, self.in_technologies.pk, self.in_description.pk]
+        for backend in (SQLiteFTSBackend(connection), PythonIndexBackend(connection)):
+            with self.subTest(backend=type(backend).__name__):
+                self.assertEqual(backend.search('django'), ranking)
+                self.assertEqual(backend.search('django', 1, 1), ranking[1:2])
+                self.assertEqual(backend.search('django', 2), ranking[2:])
+                self.assertEqual(backend.count('django'), 3)
+
+    def test_limit_is_applied_by_the_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(search_project_ids('django', 1, 1), [self.in_technologies.pk])
+        self.assertIn('LIMIT 1 OFFSET 1', queries[-1]['sql'])
+
+    @override_settings(PORTFOLIO_SEARCH_MAX_RESULTS=2)
+    def test_results_are_capped(self):
+        self.assertEqual(search_project_ids('django'), [self.in_title.pk, self.in_technologies.pk])
+        self.assertEqual(search_project_ids('django', 1, 10), [self.in_technologies.pk])
+        self.assertEqual(search_project_ids('django', 2, 10), [])
+
+    def test_missing_fts_table_is_not_remembered(self):
+        connection.portfolio_fts_table = False
+        self.assertIsInstance(get_backend('default'), SQLiteFTSBackend)
+        self.assertIs(connection.portfolio_fts_table, True)
+
+
+class RankedPaginationTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.projects = [
+            Project.objects.create(title=f'Project {i}', slug=f'project-{i}', category='Web' if i % 3 else 'Game')
+            for i in range(30)
+        ]
+        self.ranked_ids = [project.pk for project in reversed(self.projects)]
+        self.fetched = []
+
+    def fetch_ranked(self, offset, limit):
+        self.fetched.append((offset, limit))
+        return self.ranked_ids[offset:offset + limit]
+
+    def walk(self, queryset, per_page):
+        pages, cursor = [], ''
+        while True:
+            page = paginate_ranked(queryset, self.fetch_ranked, cursor, per_page=per_page)
+            pages.append([project.pk for project in page.items])
+            if not page.next_cursor:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_keep_rank_order(self):
+        pages = self.walk(Project.objects.all(), per_page=12)
+        self.assertEqual([len(page) for page in pages], [12, 12, 6])
+        self.assertEqual(sum(pages, []), self.ranked_ids)
+
+    def test_filtered_pages_skip_excluded_ids(self):
+        games = Project.objects.filter(category='Game')
+        expected = [pk for pk in self.ranked_ids if games.filter(pk=pk).exists()]
+        pages = self.walk(games, per_page=4)
+        self.assertEqual([len(page) for page in pages], [4, 4, 2])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_page_looks_up_only_a_slice(self):
+        with self.assertNumQueries(1):
+            page = paginate_ranked(Project.objects.all(), self.fetch_ranked, '', per_page=5)
+        self.assertEqual(len(page.items), 5)
+        self.assertEqual(self.fetched, [(0, 6)])
+
+
+class ClientIndexTests(PortfolioTestCase):
+    url = reverse('portfolio:search_index')
+
+    def setUp(self):
+        super().setUp()
+        self.older = Project.objects.create(title='Weather app', slug='weather', category='Mobile')
+        self.newer = Project.objects.create(
+            title='Django shop', slug='shop', category='Web', description='Sells things.',
+        )
+        self.newer.technologies.add(Technology.objects.create(name='Postgres'))
+
+    def get_index(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return json.loads(response.content)
+
+    def test_shape(self):
+        index = self.get_index()
+        self.assertEqual(set(index), {'projects', 'terms', 'postings'})
+        self.assertEqual([project['id'] for project in index['projects']], [self.newer.pk, self.older.pk])
+        self.assertEqual(index['projects'][0], {
+            'id': self.newer.pk, 'title': 'Django shop', 'url': reverse('portfolio:project_detail', args=['shop']),
+            'category': 'Web', 'technologies': ['Postgres'], 'summary': 'Sells things.', 'link': '',
+        })
+        self.assertEqual(index['terms'], sorted(index['terms']))
+        self.assertEqual(len(index['postings']), len(index['terms']))
+        # Flat [position, score, ...] pairs, weighted like the server-side index
+        self.assertEqual(index['postings'][index['terms'].index('django')], [0, 10])
+        self.assertEqual(index['postings'][index['terms'].index('postgres')], [0, 4])
+        self.assertEqual(index['postings'][index['terms'].index('mobile')], [1, 3])
+
+    def test_follows_content_changes(self):
+        etag = self.client.get(self.url)['ETag']
+        self.older.title = 'Weather station'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.older.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('station', json.loads(response.content)['terms'])
@@ -0,0 +1,127 @@
+import io
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from portfolio.models import Category, Person, PortfolioStats, Project, Technology, Testimonial
+from portfolio.stats import category_choices, portfolio_stats, rebuild_categories
+
+from .base import PortfolioTestCase
+
+
+class IndexCounterTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        for i, (category, title) in enumerate([
+            ('Web', 'Django shop'), ('Web', 'Flask blog'), ('Web', 'Django wiki'), ('Game', 'Django quiz'),
+        ]):
+            Project.objects.create(title=title, slug=f'project-{i}', category=category)
+
+    def project_total(self, **params):
+        return self.client.get(reverse('portfolio:index'), params).context['project_total']
+
+    def test_counts_every_project_without_filters(self):
+        self.assertEqual(self.project_total(), 4)
+
+    def test_counts_the_selected_category(self):
+        self.assertEqual(self.project_total(category='Web'), 3)
+        self.assertEqual(self.project_total(category='Game'), 1)
+        self.assertEqual(self.project_total(category='Nope'), 0)
+
+    def test_counts_search_matches(self):
+        self.assertEqual(self.project_total(q='django'), 3)
+        self.assertEqual(self.project_total(q='django', category='Web'), 2)
+        self.assertContains(self.client.get(reverse('portfolio:index'), {'q': 'django'}), 'data-target="3"')
+
+
+class CategoryCountTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.web = Project.objects.create(title='Shop', slug='shop', category='Web')
+        Project.objects.create(title='Blog', slug='blog', category='Web')
+        Project.objects.create(title='Quiz', slug='quiz', category='Game')
+
+    def counts(self):
+        return dict(Category.objects.values_list('name', 'project_count'))
+
+    def test_create(self):
+        self.assertEqual(self.counts(), {'Game': 1, 'Web': 2})
+        self.assertEqual(list(category_choices()), ['Game', 'Web'])
+
+    def test_save_without_a_move_changes_nothing(self):
+        self.web.title = 'Web shop'
+        self.web.save()
+        self.assertEqual(self.counts(), {'Game': 1, 'Web': 2})
+
+    def test_move_between_categories(self):
+        self.web.category = 'Game'
+        self.web.save()
+        self.assertEqual(self.counts(), {'Game': 2, 'Web': 1})
+        self.web.category = 'Data'
+        self.web.save()
+        self.assertEqual(self.counts(), {'Data': 1, 'Game': 1, 'Web': 1})
+
+    def test_delete(self):
+        Project.objects.filter(category='Web').delete()
+        self.assertEqual(self.counts(), {'Game': 1, 'Web': 0})
+        self.assertEqual(list(category_choices()), ['Game'])
+
+    def test_rebuild_after_writes_that_skip_signals(self):
+        Project.objects.filter(category='Web').update(category='Game')
+        Project.objects.bulk_create([Project(title='Tool', slug='tool', category='Data')])
+        self.assertEqual(self.counts(), {'Game': 1, 'Web': 2})
+        rebuild_categories()
+        self.assertEqual(self.counts(), {'Data': 1, 'Game': 3, 'Web': 0})
+
+
+class PortfolioStatsTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        Person.objects.create(name='Ada')
+        Project.objects.create(title='Shop', slug='shop')
+        Technology.objects.create(name='Django')
+        self.testimonial = Testimonial.objects.create(client_name='Client', quote='Great.', rating=4)
+        Testimonial.objects.create(client_name='Other', quote='Fine.', rating=3)
+
+    def totals(self):
+        stats = PortfolioStats.objects.get()
+        return (
+            stats.project_count, stats.person_count, stats.technology_count,
+            stats.testimonial_count, stats.rating_sum,
+        )
+
+    def test_create(self):
+        self.assertEqual(self.totals(), (1, 1, 1, 2, 7))
+        self.assertEqual(PortfolioStats.objects.get().average_rating, 3.5)
+
+    def test_rating_change(self):
+        self.testimonial.rating = 5
+        self.testimonial.save()
+        self.testimonial.quote = 'Great!'
+        self.testimonial.save()
+        self.assertEqual(self.totals(), (1, 1, 1, 2, 8))
+
+    def test_delete(self):
+        Person.objects.all().delete()
+        Project.objects.all().delete()
+        Technology.objects.all().delete()
+        self.testimonial.delete()
+        self.assertEqual(self.totals(), (0, 0, 0, 1, 3))
+
+    def test_missing_row(self):
+        PortfolioStats.objects.all().delete()
+        self.assertEqual(portfolio_stats().project_count, 1)
+        # The next change recreates the row from a full count
+        Project.objects.create(title='Blog', slug='blog')
+        self.assertEqual(self.totals(), (2, 1, 1, 2, 7))
+
+    def test_rebuild_stats_command(self):
+        Project.objects.bulk_create([Project(title='Blog', slug='blog'), Project(title='Quiz', slug='quiz')])
+        Testimonial.objects.filter(pk=self.testimonial.pk).update(rating=1)
+        Technology.objects.bulk_create([Technology(name='Flask')])
+        self.assertEqual(self.totals(), (1, 1, 1, 2, 7))
+
+        out = io.StringIO()
+        call_command('rebuild_stats', stdout=out)
+        self.assertEqual(self.totals(), (3, 1, 2, 2, 4))
+        self.assertIn('3 projects, 1 people, 2 technologies', out.getvalue())
@@ -0,0 +1,44 @@
+import gzip
+import os
+import tempfile
+import time
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+
+from portfolio.storage import CompressedStaticFilesStorage
+
+
+class SidecarTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.storage = CompressedStaticFilesStorage(location=self.tmp.name, base_url='/static/')
+        self.storage.save('css/site.css', ContentFile(b'.card { color: red; }\n' * 200))
+
+    def collect(self):
+        list(self.storage.post_process({}))
+
+    def sidecar(self):
+        return os.path.join(self.tmp.name, 'css/site.css.gz')
+
+    def test_sidecar_is_written(self):
+        self.collect()
+        with gzip.open(self.sidecar()) as sidecar:
+            self.assertEqual(sidecar.read(), b'.card { color: red; }\n' * 200)
+
+    def test_current_sidecar_is_kept(self):
+        self.collect()
+        with open(self.sidecar(), 'wb') as sidecar:
+            sidecar.write(b'kept')
+        self.collect()
+        with open(self.sidecar(), 'rb') as sidecar:
+            self.assertEqual(sidecar.read(), b'kept')
+
+    def test_sidecar_older_than_source_is_rebuilt(self):
+        self.collect()
+        past = time.time() - 60
+        os.utime(self.sidecar(), (past, past))
+        self.collect()
+        with gzip.open(self.sidecar()) as sidecar:
+            self.assertEqual(sidecar.read(), b'.card { color: red; }\n' * 200)
@@ -1,12 +1,22 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
 
 app_name = 'portfolio'
 
+# Read-heavy pages come from portfolio.async_views when serving over ASGI
+pages = async_views if settings.PORTFOLIO_ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.index, name='index'),
-    path('portfolio/', views.index, name='index'),
-    path('project/<slug:slug>/', views.project_detail, name='project_detail'),
-    path('contact/', views.contact, name='contact'),
+    path('', pages.index, name='index'),
+    path('portfolio/', pages.index, name='index'),
+    path('projects/fragment/', pages.project_fragment, name='project_fragment'),
+    path('project/<slug:slug>/', pages.project_detail, name='project_detail'),
+    path('contact/', pages.contact, name='contact'),
+    path('search-index.json', views.search_index, name='search_index'),
     path('contact/thanks/', views.contact_thanks, name='contact_thanks'),
+    path('api/people/', api.people, name='api_people'),
+    path('api/projects/', api.projects, name='api_projects'),
+    path('api/testimonials/', api.testimonials, name='api_testimonials'),
+    path('profiling/report.json', views.profiling_report, name='profiling_report'),
 ]
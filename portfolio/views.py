@@ -1,74 +1,180 @@
+from functools import partial
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.mail import send_mail
-from django.conf import settings
-from django.db.models import Q
-from .models import Project, Skill, Person, Experience, Education, Testimonial
+from django.views.decorators.cache import never_cache
+from django.utils.http import urlencode
+from .models import Project, Skill, Person, Experience, Education, Testimonial, Technology
+from .cache import (
+    attach_fragment_versions, cache_page_by_version, conditional_by_version, fragment_cache_timeout,
+)
+from . import profiling
+from .db.router import read_only_database
 from .forms import ContactForm
+from .mail import enqueue_contact_message
+from .pagination import paginate_keyset, paginate_ranked
+from .queries import portfolio_snapshot, projects_queryset
+from .ratelimit import limit_contact_posts, remember_message
+from .search import client_index, count_project_matches, search_project_ids
+from .stats import category_choices, category_project_count, portfolio_stats
 
 
 def gifthun(request):
     return render(request, 'portfolio/gifthun.html')
 
 
-def index(request):
-    projects = Project.objects.all()
-    people = Person.objects.all()  # Get all people
-    skills = Skill.objects.all()
-    experiences = Experience.objects.all()
-    education = Education.objects.all()
-    testimonials = Testimonial.objects.all()
-    
-    # Search functionality
-    search_query = request.GET.get('q', '')
-    if search_query:
-        projects = projects.filter(
-            Q(title__icontains=search_query) | 
-            Q(description__icontains=search_query) |
-            Q(category__icontains=search_query)
-        )
-    
+# Models each page is rendered from, for its ETag/Last-Modified
+INDEX_MODELS = (Person, Project, Skill, Technology, Experience, Education, Testimonial)
+PROJECT_MODELS = (Project, Technology)
+
+
+def public_page(*models):
+    """Read-only, revalidated and version-cached: the stack every cached public page uses.
+
+    Works on sync and async views alike; ``portfolio.async_views`` uses it too.
+    """
+    def decorator(view_func):
+        return read_only_database(conditional_by_version(*models)(cache_page_by_version(view_func)))
+    return decorator
+
+
+def _project_filters(request, projects):
+    """Projects in the requested category, plus the search query and cursor."""
     # Filter by category
     category_filter = request.GET.get('category', '')
     if category_filter:
         projects = projects.filter(category=category_filter)
-    
-    # Get unique categories for filter dropdown
-    categories = Project.objects.values_list('category', flat=True).distinct()
-    
-    return render(request, 'portfolio/index.html', {
-        'projects': projects,
-        'people': people,  # Pass all people to template
-        'skills': skills,
-        'experiences': experiences,
-        'education': education,
-        'testimonials': testimonials,
+    return projects, category_filter, request.GET.get('q', ''), request.GET.get('cursor', '')
+
+
+def _project_page_context(page, search_query, category_filter):
+    next_page_query = ''
+    if page.next_cursor:
+        params = {key: value for key, value in (('q', search_query), ('category', category_filter)) if value}
+        next_page_query = urlencode({**params, 'cursor': page.next_cursor})
+    return {
+        'projects': attach_fragment_versions(page.items),
+        'next_page_query': next_page_query,
         'search_query': search_query,
-        'categories': categories,
         'selected_category': category_filter,
-    })
+        'fragment_cache_timeout': fragment_cache_timeout(),
+    }
 
 
-def project_detail(request, slug):
+def _project_page(request, projects):
+    """Filtered, searched and paginated projects for the current request."""
+    projects, category_filter, search_query, cursor = _project_filters(request, projects)
+
+    # Search functionality, best matches first
+    if search_query:
+        page = paginate_ranked(projects, partial(search_project_ids, search_query), cursor)
+    else:
+        page = paginate_keyset(projects, cursor)
+    return _project_page_context(page, search_query, category_filter)
+
+
+def _project_total(stats, category_filter, search_query):
+    """The Projects counter: every project, or those the category and search leave."""
+    if search_query:
+        return count_project_matches(search_query, category_filter)
+    if category_filter:
+        return category_project_count(category_filter)
+    return stats.project_count
+
+
+def _index_context(snapshot, page_context):
+    """Index page context from ``portfolio_snapshot()`` (less its projects) and the project page."""
+    stats = portfolio_stats()
+    return {
+        **snapshot,
+        **page_context,
+        # Cards are cached per person, keyed on the versions attached here
+        'people': attach_fragment_versions(snapshot['people']),
+        # Categories for the filter dropdown, from the maintained Category table
+        'categories': category_choices(),
+        # Counters come from the maintained totals, not from counting rows
+        'stats': stats,
+        'project_total': _project_total(stats, page_context['selected_category'], page_context['search_query']),
+    }
+
+
+def _submit_contact(request):
+    """The contact form for ``request``, and whether a valid POST was queued."""
+    if request.method != 'POST':
+        return ContactForm(), False
+    form = ContactForm(request.POST)
+    if not form.is_valid():
+        return form, False
+    message = (form.cleaned_data['name'], form.cleaned_data['email'], form.cleaned_data['message'])
+    # Queued for manage.py drain_outbox so a slow mail server never blocks the response
+    enqueue_contact_message(*message)
+    remember_message(*message)
+    return form, True
+
+
+# Page bodies. The async views in portfolio.async_views run each of these in
+# a single worker thread hop: every extra hop costs more than the query it
+# would have moved off the thread.
+
+def _render_index(request):
+    snapshot = portfolio_snapshot()
+    page_context = _project_page(request, snapshot.pop('projects'))
+    return render(request, 'portfolio/index.html', _index_context(snapshot, page_context))
+
+
+def _render_project_fragment(request):
+    page_context = _project_page(request, projects_queryset())
+    return render(request, 'portfolio/_project_fragment.html', page_context)
+
+
+def _render_project_detail(request, slug):
     project = get_object_or_404(Project, slug=slug)
     return render(request, 'portfolio/project_detail.html', {'project': project})
 
 
+def _render_contact(request):
+    form, queued = _submit_contact(request)
+    if queued:
+        return redirect('portfolio:contact_thanks')
+    return render(request, 'portfolio/contact.html', {'form': form, 'people': Person.objects.all()})
+
+
+@public_page(*INDEX_MODELS)
+def index(request):
+    return _render_index(request)
+
+
+@public_page(*PROJECT_MODELS)
+def project_fragment(request):
+    """Next page of project cards as an HTML fragment, for infinite scroll."""
+    return _render_project_fragment(request)
+
+
+@public_page(*PROJECT_MODELS)
+def project_detail(request, slug):
+    return _render_project_detail(request, slug)
+
+
+@read_only_database
+@conditional_by_version(Person, vary_on_csrf=True)
+@limit_contact_posts
 def contact(request):
-    people = Person.objects.all()
-    if request.method == 'POST':
-        form = ContactForm(request.POST)
-        if form.is_valid():
-            name = form.cleaned_data['name']
-            email = form.cleaned_data['email']
-            message = form.cleaned_data['message']
-            subject = f'Contact form submission from {name}'
-            body = f'From: {name} <{email}>\n\n{message}'
-            send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [settings.DEFAULT_FROM_EMAIL], fail_silently=False)
-            return redirect('portfolio:contact_thanks')
-    else:
-        form = ContactForm()
-    return render(request, 'portfolio/contact.html', {'form': form, 'people': people})
+    return _render_contact(request)
+
+
+@public_page(*PROJECT_MODELS)
+def search_index(request):
+    """Prebuilt project search index, searched in the browser by static/js/main.js."""
+    return JsonResponse(client_index(), json_dumps_params={'separators': (',', ':'), 'ensure_ascii': False})
 
 
 def contact_thanks(request):
     return render(request, 'portfolio/contact_thanks.html')
+
+
+@never_cache
+@staff_member_required
+def profiling_report(request):
+    """Request timings collected by portfolio.profiling.ProfilingMiddleware"""
+    return JsonResponse(profiling.report(), json_dumps_params={'indent': 2})
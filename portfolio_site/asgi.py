@@ -0,0 +1,8 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_site.settings')
+# Serve the async versions of the public pages unless explicitly turned off
+os.environ.setdefault('PORTFOLIO_ASYNC_VIEWS', '1')
+
+application = get_asgi_application()
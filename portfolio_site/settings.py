@@ -24,6 +24,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Inactive unless PORTFOLIO_PROFILING is on; first so it times the whole stack
+    'portfolio.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -53,14 +55,66 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'portfolio_site.wsgi.application'
 
+# Route the public pages to portfolio.async_views (on by default under asgi.py).
+# They are slower than the sync views under WSGI; see that module's docstring.
+PORTFOLIO_ASYNC_VIEWS = os.environ.get('PORTFOLIO_ASYNC_VIEWS') == '1'
+
 # Database
+# portfolio.db is the sqlite3 backend with tuned pragmas (see
+# portfolio/db/base.py; override them with OPTIONS['pragmas']). The 'readonly'
+# alias opens the same file read-only for the public pages.
+# WAL journaling lets the public pages read while the admin writes, but it is
+# recorded in the database file itself, so it is opt-in: set
+# PORTFOLIO_SQLITE_WAL=1 on deployments whose database isn't the tracked one.
+PORTFOLIO_SQLITE_WAL = os.environ.get('PORTFOLIO_SQLITE_WAL') == '1'
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'portfolio.db',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections between requests under WSGI. ASGI runs each request's
+        # queries in a fresh thread, where a kept connection would never be reused.
+        'CONN_MAX_AGE': 0 if PORTFOLIO_ASYNC_VIEWS else 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'wal': PORTFOLIO_SQLITE_WAL},
+    },
+}
+DATABASES['readonly'] = {
+    **DATABASES['default'],
+    'OPTIONS': {'read_only': True},
+    'TEST': {'MIRROR': 'default'},
+}
+DATABASE_ROUTERS = ['portfolio.db.router.ReadOnlyRouter']
+# Alias read by views wrapped in portfolio.db.router.read_only_database
+PORTFOLIO_READ_DATABASE = 'readonly'
+
+# Cache
+# Rendered pages are cached per content version (see portfolio/cache.py), so
+# any backend works. LocMemCache is per process; to share the cache between
+# several workers use the file-based backend instead:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / '.cache',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio',
     }
 }
 
+# Cache alias and lifetime (seconds) for the versioned page cache
+PORTFOLIO_CACHE_ALIAS = 'default'
+PORTFOLIO_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+# Lifetime of the per-person/per-project card fragments; these survive edits
+# to other objects, since their keys carry a version per object
+PORTFOLIO_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Projects shown per page on the index (and per infinite-scroll fragment)
+PORTFOLIO_PROJECTS_PER_PAGE = 12
+# Search results can be paged through this far down the ranking
+PORTFOLIO_SEARCH_MAX_RESULTS = 1000
+
+# /api/projects/ streams its payload (while caching it) above this many projects
+PORTFOLIO_API_STREAM_OVER = 500
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -73,14 +127,63 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+# collectstatic target. Files are copied under content-hashed names listed in
+# staticfiles.json, and text assets get .gz (and .br with brotli) siblings.
+# With DEBUG on, {% static %} keeps the plain names and collectstatic is optional.
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'portfolio.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Serve /static/ and /media/ (with precompressed variants) from Django itself,
+# with the immutable Cache-Control below on content-hashed names once DEBUG is
+# off. Set PORTFOLIO_SERVE_ASSETS=0 when a front-end server handles those paths.
+PORTFOLIO_SERVE_ASSETS = os.environ.get('PORTFOLIO_SERVE_ASSETS', '1') == '1'
+
+# Cache-Control for content-hashed static files (one year, never revalidated)
+PORTFOLIO_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 # Media files (User uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Widths (px) of the WebP/JPEG derivatives made for uploaded photos
+PORTFOLIO_IMAGE_WIDTHS = (320, 640, 960, 1280)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email for contact form during development: print to console
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # Default from email used when sending messages from site
 DEFAULT_FROM_EMAIL = 'webmaster@localhost'
+
+# Contact form outbox, sent by `python manage.py drain_outbox [--loop]`
+PORTFOLIO_OUTBOX_BATCH_SIZE = 50
+PORTFOLIO_OUTBOX_MAX_ATTEMPTS = 5
+# Retry delays double from RETRY_DELAY seconds up to MAX_RETRY_DELAY
+PORTFOLIO_OUTBOX_RETRY_DELAY = 30
+PORTFOLIO_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+
+# Contact form limits: scope -> (messages allowed, window length in seconds)
+PORTFOLIO_CONTACT_RATE_LIMITS = {
+    'ip': (5, 10 * 60),
+    'email': (3, 60 * 60),
+}
+# Identical messages resubmitted within this many seconds are dropped
+PORTFOLIO_CONTACT_DEDUP_WINDOW = 60 * 60
+# Only enable behind a proxy that sets X-Forwarded-For itself
+PORTFOLIO_TRUST_X_FORWARDED_FOR = False
+
+# Per-request SQL/template timing, reported at /profiling/report.json (staff only)
+PORTFOLIO_PROFILING = os.environ.get('PORTFOLIO_PROFILING') == '1'
+PORTFOLIO_PROFILING_BUFFER_SIZE = 1000
+
+# Admin changelists of tables bigger than this use the database's row estimate
+# instead of COUNT(*) when no filter or search applies
+PORTFOLIO_ADMIN_ESTIMATE_COUNT_OVER = 10000
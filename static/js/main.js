@@ -1,4 +1,4 @@
-// main.js — small UI enhancements: typing effect, counters, scroll reveal
+// main.js — small UI enhancements: typing effect, counters, scroll reveal, instant project search
 
 document.addEventListener('DOMContentLoaded', () => {
   // Typing effect on elements with .typing and data-words
@@ -61,26 +61,211 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   });
 
-  // Project detail toggles
-  document.querySelectorAll('.project-toggle').forEach(btn => {
-    btn.addEventListener('click', (e) => {
-      const id = btn.getAttribute('data-target');
-      const panel = document.getElementById(id);
-      if (!panel) return;
-      const expanded = btn.getAttribute('aria-expanded') === 'true';
-      btn.setAttribute('aria-expanded', String(!expanded));
-      if (!expanded) {
-        panel.classList.add('open');
-        // set max-height based on scrollHeight to animate smoothly
-        panel.style.maxHeight = panel.scrollHeight + 'px';
-        panel.focus && panel.focus();
-      } else {
-        panel.style.maxHeight = panel.scrollHeight + 'px';
-        // force reflow
-        void panel.offsetHeight;
-        panel.style.maxHeight = '0px';
-        panel.classList.remove('open');
-      }
-    });
+  // Project detail toggles (delegated so cards added by infinite scroll work too)
+  document.addEventListener('click', (e) => {
+    const btn = e.target.closest('.project-toggle');
+    if (!btn) return;
+    const id = btn.getAttribute('data-target');
+    const panel = document.getElementById(id);
+    if (!panel) return;
+    const expanded = btn.getAttribute('aria-expanded') === 'true';
+    btn.setAttribute('aria-expanded', String(!expanded));
+    if (!expanded) {
+      panel.classList.add('open');
+      // set max-height based on scrollHeight to animate smoothly
+      panel.style.maxHeight = panel.scrollHeight + 'px';
+      panel.focus && panel.focus();
+    } else {
+      panel.style.maxHeight = panel.scrollHeight + 'px';
+      // force reflow
+      void panel.offsetHeight;
+      panel.style.maxHeight = '0px';
+      panel.classList.remove('open');
+    }
   });
+
+  // Infinite scroll: fetch the next page of project cards as an HTML fragment
+  // when the "Load more" link comes into view. Without JS the link still works.
+  const loadMore = document.querySelector('.load-more[data-fragment-url]');
+  const projectList = document.getElementById('projects');
+  if (loadMore && projectList && 'IntersectionObserver' in window) {
+    let loading = false;
+    const fetchNext = () => {
+      const url = loadMore.dataset.fragmentUrl;
+      if (loading || !url) return;
+      loading = true;
+      fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(resp => resp.ok ? resp.text() : Promise.reject(resp))
+        .then(html => {
+          const tpl = document.createElement('template');
+          tpl.innerHTML = html;
+          // The fragment ends with a hidden marker pointing at the page after it
+          const marker = tpl.content.querySelector('.project-next');
+          const next = marker && marker.getAttribute('data-fragment-url');
+          if (marker) marker.remove();
+          tpl.content.querySelectorAll('.reveal').forEach(el => observer.observe(el));
+          projectList.appendChild(tpl.content);
+          if (next) {
+            loadMore.dataset.fragmentUrl = next;
+          } else {
+            loadMore.parentElement.remove();
+            scrollObserver.disconnect();
+          }
+        })
+        .catch(() => { /* leave the plain link as a fallback */ })
+        .finally(() => { loading = false; });
+    };
+    const scrollObserver = new IntersectionObserver((entries) => {
+      if (entries.some(entry => entry.isIntersecting)) fetchNext();
+    }, { rootMargin: '400px' });
+    scrollObserver.observe(loadMore);
+    loadMore.addEventListener('click', (e) => { e.preventDefault(); fetchNext(); });
+  }
+
+  // Instant project search over the prebuilt index (search-index.json, made by
+  // portfolio.search.client_index). Typing or picking a category filters the
+  // list in the browser; if the index can't be loaded the form submits as usual.
+  const searchForm = document.querySelector('.search-form[data-search-index]');
+  if (searchForm && projectList && window.fetch) {
+    const searchInput = searchForm.querySelector('input[name="q"]');
+    const categorySelect = document.querySelector(`select[name="category"][form="${searchForm.id}"]`);
+    const moreBlock = document.querySelector('.projects-more');
+    // Cards built from the index are capped; the rest need a narrower query
+    const MAX_RESULTS = 120;
+    let indexRequest = null;
+    let unfiltered = null;
+    const cards = new Map();
+
+    const loadIndex = () => indexRequest || (indexRequest = fetch(searchForm.dataset.searchIndex)
+      .then(resp => resp.ok ? resp.json() : Promise.reject(resp))
+      .catch(err => { indexRequest = null; throw err; }));
+
+    // Same tokens as portfolio.search.tokenize: lowercase, accents stripped
+    const tokenize = text => (text || '').normalize('NFKD').replace(/\p{M}/gu, '').toLowerCase()
+      .match(/[\p{L}\p{N}_]+/gu) || [];
+
+    const firstTermFrom = (terms, token) => {
+      let lo = 0, hi = terms.length;
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (terms[mid] < token) lo = mid + 1; else hi = mid;
+      }
+      return lo;
+    };
+
+    // Positions of the projects matching every word as a prefix, best first
+    const search = (index, query) => {
+      let scores = null;
+      for (const token of tokenize(query)) {
+        const found = new Map();
+        for (let i = firstTermFrom(index.terms, token); i < index.terms.length && index.terms[i].startsWith(token); i++) {
+          const postings = index.postings[i];
+          for (let j = 0; j < postings.length; j += 2) {
+            found.set(postings[j], (found.get(postings[j]) || 0) + postings[j + 1]);
+          }
+        }
+        scores = scores === null ? found
+          : new Map([...scores].filter(([pos]) => found.has(pos)).map(([pos, score]) => [pos, score + found.get(pos)]));
+      }
+      if (scores === null) return index.projects.map((_, pos) => pos);
+      return [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).map(([pos]) => pos);
+    };
+
+    const element = (tag, className, text) => {
+      const el = document.createElement(tag);
+      if (className) el.className = className;
+      if (text) el.textContent = text;
+      return el;
+    };
+
+    // Plain card for a project whose server-rendered card isn't on the page
+    const buildCard = project => {
+      const item = element('li', 'project-item');
+      item.dataset.projectId = project.id;
+      const content = item.appendChild(element('div', 'project-content'));
+      const link = content.appendChild(element('h3')).appendChild(element('a', '', project.title));
+      link.href = project.url;
+      if (project.category) content.appendChild(element('p', 'project-category', project.category));
+      if (project.technologies.length) {
+        const techs = content.appendChild(element('div', 'project-technologies'));
+        project.technologies.forEach(name => techs.appendChild(element('span', 'tech-tag', name)));
+      }
+      if (project.summary) content.appendChild(element('p', '', project.summary));
+      if (project.link) {
+        const external = content.appendChild(element('a', 'cta-button secondary', 'View Project →'));
+        external.href = project.link;
+        external.target = '_blank';
+      }
+      return item;
+    };
+
+    const message = text => {
+      const item = element('li', 'project-item');
+      item.appendChild(element('p', 'search-message', text));
+      return item;
+    };
+
+    const showUrl = (query, category) => {
+      const params = new URLSearchParams();
+      if (query) params.set('q', query);
+      if (category) params.set('category', category);
+      const queryString = params.toString();
+      history.replaceState(null, '', location.pathname + (queryString ? `?${queryString}` : '') + location.hash);
+    };
+
+    const restore = () => {
+      if (unfiltered) projectList.replaceChildren(...unfiltered);
+      unfiltered = null;
+      if (moreBlock) moreBlock.hidden = false;
+      showUrl('', '');
+    };
+
+    const apply = index => {
+      const query = searchInput ? searchInput.value.trim() : '';
+      const category = categorySelect ? categorySelect.value : '';
+      if (!query && !category) {
+        // A page the server filtered doesn't hold the full list: fetch it
+        if (searchForm.hasAttribute('data-filtered')) location.search = '';
+        else restore();
+        return;
+      }
+      if (!unfiltered) {
+        unfiltered = Array.from(projectList.children);
+        unfiltered.forEach(el => { if (el.dataset.projectId) cards.set(Number(el.dataset.projectId), el); });
+      }
+      const matches = search(index, query)
+        .map(pos => index.projects[pos])
+        .filter(project => !category || project.category === category);
+      const shown = matches.slice(0, MAX_RESULTS).map(project => cards.get(project.id) || buildCard(project));
+      if (!matches.length) shown.push(message('No projects found. Try adjusting your filters.'));
+      if (matches.length > MAX_RESULTS) {
+        shown.push(message(`Showing the first ${MAX_RESULTS} of ${matches.length} projects. Refine your search to see more.`));
+      }
+      projectList.replaceChildren(...shown);
+      if (moreBlock) moreBlock.hidden = true;
+      showUrl(query, category);
+    };
+
+    let typingTimer = null;
+    const filter = fallback => loadIndex().then(apply).catch(fallback || (() => {}));
+    const submitToServer = () => searchForm.submit();
+
+    searchForm.addEventListener('submit', (e) => { e.preventDefault(); filter(submitToServer); });
+    if (searchInput) {
+      searchInput.addEventListener('focus', () => loadIndex().catch(() => {}), { once: true });
+      searchInput.addEventListener('input', () => {
+        clearTimeout(typingTimer);
+        typingTimer = setTimeout(() => filter(), 120);
+      });
+    }
+    if (categorySelect) categorySelect.addEventListener('change', () => filter(submitToServer));
+
+    // The static export has no server to filter ?q=/?category= links; do it here
+    const params = new URLSearchParams(location.search);
+    if (!searchForm.hasAttribute('data-filtered') && (params.get('q') || params.get('category'))) {
+      if (searchInput) searchInput.value = params.get('q') || '';
+      if (categorySelect) categorySelect.value = params.get('category') || '';
+      filter();
+    }
+  }
 });